@@ -1,12 +1,40 @@
+import importlib
+
 import streamlit as st
-from datetime import date
+from datetime import date, datetime
+
+from kpis.debug_panel import debug_actif, render_debug_panel
+from preprocessing import profiling
+from preprocessing.kpi_store import lire_kpis
 
 # ===============================
-# IMPORT PAGES KPI
+# REGISTRE DES PAGES KPI
 # ===============================
-from kpis.productivite import page_productivite
-from kpis.efficience import page_efficience
-from kpis.llti import page_llti
+# Modules importés uniquement quand la page est affichée : l'accueil ne
+# charge ni pandas, ni matplotlib, ni seaborn
+PAGES_KPI = {
+    "Productivité": ("kpis.productivite", "page_productivite"),
+    "Efficience": ("kpis.efficience", "page_efficience"),
+    "LLTI": ("kpis.llti", "page_llti"),
+}
+
+
+def charger_page(nom: str):
+    module, fonction = PAGES_KPI[nom]
+    return getattr(importlib.import_module(module), fonction)
+
+
+def metric_kpi(kpis: dict, label: str, nom: str, fmt: str, aide: str):
+    """
+    Dernière valeur enregistrée d'un KPI, "—" si jamais calculé
+    """
+    kpi = kpis.get(nom)
+    if kpi is None:
+        st.metric(label, "—", help=aide)
+        return
+
+    maj = datetime.fromisoformat(kpi["maj"]).strftime("%d/%m/%Y %H:%M")
+    st.metric(label, format(kpi["valeur"], fmt), help=f"Mis à jour le {maj}")
 
 
 # ===============================
@@ -24,11 +52,15 @@ st.set_page_config(
 if "page" not in st.session_state:
     st.session_state.page = "Accueil"
 
-if "productivite_globale" not in st.session_state:
-    st.session_state.productivite_globale = None
 
-if "productivite_calculee" not in st.session_state:
-    st.session_state.productivite_calculee = False
+# ===============================
+# MODE DEBUG (profilage des étapes)
+# ===============================
+# Profil propre à la session : les autres sessions ne sont pas mesurées
+DEBUG = debug_actif()
+if DEBUG and "profil" not in st.session_state:
+    st.session_state.profil = profiling.nouveau_profil()
+profiling.set_enabled(DEBUG, st.session_state.get("profil"))
 
 
 # ===============================
@@ -65,26 +97,33 @@ if page == "Accueil":
     # ===============================
     # RÉSUMÉ KPI
     # ===============================
+    # Dernières valeurs calculées (pages KPI ou batch), sans recalcul
+    kpis = lire_kpis()
+
     col1, col2, col3 = st.columns(3)
 
     with col1:
-        if st.session_state.productivite_calculee:
-            st.metric(
-                "Productivité YTD",
-                f"{st.session_state.productivite_globale:.1%}"
-            )
-        else:
-            st.metric(
-                "Productivité YTD",
-                "—",
-                help="Chargez le fichier de pointages pour calculer la productivité"
-            )
-
+        metric_kpi(
+            kpis, "Productivité YTD", "productivite_ytd", ".1%",
+            "Chargez le fichier de pointages pour calculer la productivité"
+        )
         st.metric("Inspection Rate", "—")
+        metric_kpi(
+            kpis, "Efficience OR", "efficience_moyenne", ".2f",
+            "Chargez le fichier d’efficience consolidée"
+        )
 
     with col2:
         st.metric("Service Response", "—")
         st.metric("PM Accuracy", "—")
+        # Unité enregistrée avec la valeur (jours calendaires par défaut)
+        jours_ouvres = kpis.get("llti_moyen", {}).get("unite") == "ouvres"
+        metric_kpi(
+            kpis,
+            "LLTI moyen (jours ouvrés)" if jours_ouvres else "LLTI moyen (jours)",
+            "llti_moyen", ".1f",
+            "Chargez le fichier BO pour calculer le LLTI"
+        )
 
     with col3:
         st.metric("CVA Fulfillment", "—")
@@ -122,35 +161,11 @@ if page == "Accueil":
 
 
 # ===============================
-# PAGE PRODUCTIVITÉ
+# PAGES KPI (PRODUCTIVITÉ, EFFICIENCE, LLTI)
 # ===============================
-elif page == "Productivité":
+elif page in PAGES_KPI:
 
-    page_productivite()
-
-    st.divider()
-    if st.button("⬅️ Retour à l’accueil"):
-        st.session_state.page = "Accueil"
-
-
-# ===============================
-# PAGE EFFICIENCE
-# ===============================
-elif page == "Efficience":
-
-    page_efficience()
-
-    st.divider()
-    if st.button("⬅️ Retour à l’accueil"):
-        st.session_state.page = "Accueil"
-
-
-# ===============================
-# PAGE LLTI
-# ===============================
-elif page == "LLTI":
-
-    page_llti()
+    charger_page(page)()
 
     st.divider()
     if st.button("⬅️ Retour à l’accueil"):
@@ -183,3 +198,10 @@ elif page == "PIP":
     st.info("Page à implémenter")
     if st.button("⬅️ Retour à l’accueil"):
         st.session_state.page = "Accueil"
+
+
+# ===============================
+# PANNEAU DEBUG
+# ===============================
+if DEBUG:
+    render_debug_panel()
@@ -0,0 +1,41 @@
+# batch_kpis.py
+#
+# Calcul des KPI hors Streamlit (planification nocturne)
+#   python batch_kpis.py --pointages pointages.xlsx --bo bo.xlsx \
+#       --efficience efficience.xlsx --out exports/
+
+import argparse
+import json
+
+from preprocessing.kpi_engine import run_batch
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Calcule les KPI Méthode & Process vers Parquet / JSON"
+    )
+    parser.add_argument("--pointages", help="Extraction 3 mois glissants (Pointages Service)")
+    parser.add_argument("--bo", help="Fichier BO – Facturation Service (xlsx ou CSV)")
+    parser.add_argument("--efficience", help="Fichier Efficience consolidée (Power Query)")
+    parser.add_argument("--out", default="exports", help="Répertoire de sortie")
+    parser.add_argument(
+        "--llti-jours-ouvres", action="store_true",
+        help="LLTI en jours ouvrés (calendrier Sénégal) au lieu de calendaires"
+    )
+    args = parser.parse_args(argv)
+
+    if not (args.pointages or args.bo or args.efficience):
+        parser.error("au moins un fichier d'extraction est requis")
+
+    summary = run_batch(
+        args.out,
+        pointages=args.pointages,
+        bo=args.bo,
+        efficience=args.efficience,
+        mode_llti="ouvres" if args.llti_jours_ouvres else "calendaires",
+    )
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
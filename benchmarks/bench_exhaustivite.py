@@ -0,0 +1,83 @@
+# benchmarks/bench_exhaustivite.py
+#
+# Équivalence + benchmark de la classification des statuts de pointage
+#   python -m benchmarks.bench_exhaustivite --rows 1000000
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from preprocessing.exhaustivite_preprocessing import (
+    STATUTS,
+    classer_statuts,
+    statut_pointage,
+)
+
+
+def generer_jours(n: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Lignes technicien/jour synthétiques couvrant tous les statuts
+    (y compris valeurs manquantes)
+    """
+    rng = np.random.default_rng(seed)
+
+    hr_totale = rng.choice([0.0, 2.5, 4.0, 8.0, 9.5, np.nan], size=n)
+    hr_theorique = rng.choice([0.0, 8.0, 8.0, 8.0, np.nan], size=n)
+    weekday = rng.integers(0, 7, size=n).astype("float64")
+    weekday[rng.random(n) < 0.001] = np.nan
+
+    return pd.DataFrame({
+        "Hr_Totale": hr_totale,
+        "Hr_Théorique": hr_theorique,
+        "Jour_semaine": weekday,
+    })
+
+
+def statuts_reference(df: pd.DataFrame) -> pd.Series:
+    # Implémentation historique (apply ligne à ligne)
+    return df.apply(
+        lambda r: statut_pointage(
+            r["Hr_Totale"],
+            r["Hr_Théorique"],
+            r["Jour_semaine"]
+        ),
+        axis=1
+    )
+
+
+def statuts_vectorises(df: pd.DataFrame) -> np.ndarray:
+    return STATUTS[
+        classer_statuts(df["Hr_Totale"], df["Hr_Théorique"], df["Jour_semaine"])
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    df = generer_jours(args.rows)
+
+    t0 = time.perf_counter()
+    ref = statuts_reference(df)
+    t_ref = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    vec = statuts_vectorises(df)
+    t_vec = time.perf_counter() - t0
+
+    ecarts = int((ref.to_numpy() != vec).sum())
+    if ecarts:
+        raise SystemExit(f"❌ {ecarts} statuts divergents")
+
+    print(f"Lignes            : {args.rows:,}")
+    print(f"apply (référence) : {t_ref:.3f} s")
+    print(f"np.select         : {t_vec:.3f} s")
+    print(f"Accélération      : x{t_ref / t_vec:.0f}")
+    print("✅ Statuts identiques")
+
+
+if __name__ == "__main__":
+    main()
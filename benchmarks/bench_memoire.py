@@ -0,0 +1,57 @@
+# benchmarks/bench_memoire.py
+#
+# Empreinte mémoire (octets / ligne) des DF canoniques, types compacts vs object / float64
+#   python -m benchmarks.bench_memoire --techniciens 300 --jours 1095
+
+import argparse
+
+import pandas as pd
+
+from benchmarks import synthetic
+from preprocessing.llti_preprocess import filtrer_bo
+from preprocessing.pointage_warehouse import dater_extraction
+from preprocessing.preprocess_productivite import preprocess_productivite
+from preprocessing.schemas import SCHEMAS, apply_schema, octets_par_ligne
+
+
+def _large(df: pd.DataFrame) -> pd.DataFrame:
+    # Référence : chaînes en object, numériques en float64 / int64
+    return df.astype({
+        col: "object" if isinstance(dtype, (pd.CategoricalDtype, pd.StringDtype))
+        else "float64" if dtype == "float32"
+        else "int64" if dtype == "int8"
+        else dtype
+        for col, dtype in df.dtypes.items()
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--techniciens", type=int, default=300)
+    parser.add_argument("--jours", type=int, default=1095)
+    parser.add_argument("--factures", type=int, default=100_000)
+    parser.add_argument("--or", dest="n_or", type=int, default=50_000)
+    args = parser.parse_args()
+
+    frames = {
+        # Tel qu'ingéré et historisé : avec la date d'extraction
+        "pointages (jour)": dater_extraction(preprocess_productivite(
+            apply_schema(synthetic.pointages(args.techniciens, args.jours), SCHEMAS["pointage"])
+        )),
+        "bo filtré": filtrer_bo(apply_schema(synthetic.bo(args.factures), SCHEMAS["bo"]), None),
+        "efficience": apply_schema(
+            synthetic.efficience(args.n_or, args.techniciens), SCHEMAS["efficience"]
+        ),
+    }
+
+    print(f"{'DF':<18} {'lignes':>10} {'compact o/l':>12} {'large o/l':>10} {'total Mo':>9}")
+    for nom, df in frames.items():
+        compact = octets_par_ligne(df)
+        print(
+            f"{nom:<18} {len(df):>10,} {compact:>12.1f} "
+            f"{octets_par_ligne(_large(df)):>10.1f} {compact * len(df) / 1e6:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
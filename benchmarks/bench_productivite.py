@@ -0,0 +1,38 @@
+# benchmarks/bench_productivite.py
+#
+# Débit (lignes/s) de preprocess_productivite sur pointages synthétiques
+#   python -m benchmarks.bench_productivite --sizes 100000 1000000 5000000
+
+import argparse
+import time
+
+from benchmarks.synthetic import pointages_lignes
+from preprocessing.preprocess_productivite import preprocess_productivite
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--sizes", type=int, nargs="+",
+        default=[100_000, 1_000_000, 5_000_000]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'lignes':>12} {'meilleur (s)':>13} {'lignes/s':>14} {'sortie':>10}")
+
+    for n in args.sizes:
+        df_raw = pointages_lignes(n)
+
+        timings = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            df_day = preprocess_productivite(df_raw)
+            timings.append(time.perf_counter() - t0)
+
+        best = min(timings)
+        print(f"{n:>12,} {best:>13.3f} {n / best:>14,.0f} {len(df_day):>10,}")
+
+
+if __name__ == "__main__":
+    main()
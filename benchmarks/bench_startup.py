@@ -0,0 +1,78 @@
+# benchmarks/bench_startup.py
+#
+# Budget de démarrage à froid de la page Accueil (python -X importtime)
+#   python -m benchmarks.bench_startup --budget-ms 150
+#
+# Mesure le coût d'import ajouté par app.py au-delà de Streamlit lui-même
+# et vérifie qu'aucun module lourd n'est chargé avant le routage.
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules qui ne doivent pas être importés pour afficher l'accueil
+# (preprocessing.kpi_store et kpis.debug_panel, légers, sont autorisés)
+INTERDITS = [
+    "pandas", "numpy", "matplotlib", "seaborn", "pyarrow", "openpyxl",
+    "kpis.productivite", "kpis.efficience", "kpis.llti",
+]
+
+
+def importtime(code: str) -> dict[str, int]:
+    """
+    Temps d'import propre (µs) par module pour un snippet Python
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    temps = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, module = line[len("import time:"):].split("|")
+        temps[module.strip()] = int(self_us)
+    return temps
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget-ms", type=float, default=150.0)
+    args = parser.parse_args()
+
+    base = importtime("import streamlit")
+    app = importtime("import runpy; runpy.run_path('app.py')")
+
+    ajoutes = {m: t for m, t in app.items() if m not in base}
+    total_ms = sum(ajoutes.values()) / 1000
+
+    interdits = sorted(
+        m for m in ajoutes
+        if any(m == x or m.startswith(x + ".") for x in INTERDITS)
+    )
+
+    print(f"Streamlit seul      : {sum(base.values()) / 1000:.0f} ms")
+    print(f"Ajouté par l'accueil: {total_ms:.0f} ms ({len(ajoutes)} modules)")
+    for module, t in sorted(ajoutes.items(), key=lambda kv: -kv[1])[:10]:
+        print(f"  {t / 1000:8.1f} ms  {module}")
+
+    erreurs = []
+    if interdits:
+        erreurs.append(f"modules lourds importés : {', '.join(interdits[:10])}")
+    if total_ms > args.budget_ms:
+        erreurs.append(f"budget dépassé : {total_ms:.0f} ms > {args.budget_ms:.0f} ms")
+
+    if erreurs:
+        raise SystemExit("❌ " + " ; ".join(erreurs))
+    print("✅ Démarrage dans le budget")
+
+
+if __name__ == "__main__":
+    main()
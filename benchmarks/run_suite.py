@@ -0,0 +1,167 @@
+# benchmarks/run_suite.py
+#
+# Benchmark de bout en bout des étapes du pipeline sur données synthétiques
+#   python -m benchmarks.run_suite --scales small medium
+#   python -m benchmarks.run_suite --compare benchmarks/results/<commit>.json
+#
+# Résultats : benchmarks/results/<commit>.json (comparables entre commits)
+
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import synthetic
+from preprocessing.bo_stream import read_bo_filtered
+from preprocessing.efficience_filters import build_filtre_index
+from preprocessing.efficience_synthese import build_synthese
+from preprocessing.exhaustivite_preprocessing import compute_exhaustivite
+from preprocessing.kpi_engine import kpis_efficience, kpis_productivite
+from preprocessing.llti_preprocess import calculer_llti, filtrer_bo, finaliser_llti
+from preprocessing.preprocess_productivite import preprocess_productivite
+from preprocessing.productivite_cube import build_cube
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+
+# Tailles par échelle : techniciens x jours (pointages), factures, OR
+SCALES = {
+    "small": {"techniciens": 50, "jours": 90, "factures": 5_000, "or": 2_000},
+    "medium": {"techniciens": 300, "jours": 90, "factures": 50_000, "or": 20_000},
+    "large": {"techniciens": 1_000, "jours": 365, "factures": 300_000, "or": 100_000},
+}
+
+
+def _mesure(fn, repeat: int) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def run_scale(nom: str, taille: dict, repeat: int, excel: bool) -> list[dict]:
+    raw_p = synthetic.pointages(taille["techniciens"], taille["jours"])
+    raw_bo = synthetic.bo(taille["factures"])
+    raw_eff = synthetic.efficience(taille["or"], taille["techniciens"])
+
+    resultats = []
+
+    def bench(etape: str, fn, rows_in: int):
+        secondes, result = _mesure(fn, repeat)
+        resultats.append({
+            "scale": nom,
+            "stage": etape,
+            "rows_in": rows_in,
+            "seconds": round(secondes, 4),
+            "rows_per_s": round(rows_in / secondes) if secondes > 0 else None,
+        })
+        print(f"  {etape:<28} {rows_in:>10,} lignes  {secondes:8.3f} s")
+        return result
+
+    print(f"[{nom}]")
+
+    # Pointages -> productivité / exhaustivité
+    df_day = bench("preprocess_productivite", lambda: preprocess_productivite(raw_p), len(raw_p))
+    bench("compute_exhaustivite", lambda: compute_exhaustivite(df_day), len(df_day))
+    cube = bench("build_cube", lambda: build_cube(df_day), len(df_day))
+    mois = cube.labels["Mois"][-1]
+    equipes = cube.labels["Equipe3"][: max(1, len(cube.labels["Equipe3"]) // 2)]
+    bench("kpis_productivite", lambda: kpis_productivite(cube, mois, equipes), len(df_day))
+
+    # BO -> LLTI
+    debut = raw_bo["Date Facture (Lignes)"].min()
+    bench(
+        "preprocess_llti",
+        lambda: finaliser_llti(filtrer_bo(raw_bo, debut)),
+        len(raw_bo)
+    )
+    bo_filtre = filtrer_bo(raw_bo, debut)
+    for mode in ["calendaires", "ouvres"]:
+        bench(f"llti_jours_{mode}", lambda: calculer_llti(bo_filtre, mode), len(bo_filtre))
+
+    # Efficience
+    index = bench("build_filtre_index", lambda: build_filtre_index(raw_eff), len(raw_eff))
+    selections = {
+        "Equipe": index.valeurs["Equipe"][::2],
+        "Position": [],
+        "Type OR": index.valeurs["Type OR"][:2],
+    }
+    bench("kpis_efficience", lambda: kpis_efficience(index, selections), len(raw_eff))
+    bench("build_synthese", lambda: build_synthese(index.df), len(raw_eff))
+
+    # Lecture Excel (openpyxl), optionnelle : lente à générer sur grandes échelles
+    if excel:
+        buffer = io.BytesIO()
+        raw_bo.to_excel(buffer, index=False)
+        data = buffer.getvalue()
+        bench("read_excel_bo", lambda: pd.read_excel(io.BytesIO(data)), len(raw_bo))
+        bench("read_bo_filtered", lambda: read_bo_filtered(data, debut), len(raw_bo))
+
+    return resultats
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "inconnu"
+
+
+def comparer(actuel: list[dict], reference_path: Path):
+    reference = json.loads(reference_path.read_text(encoding="utf-8"))
+    ref = {(r["scale"], r["stage"]): r["seconds"] for r in reference["results"]}
+
+    print(f"\nComparaison avec {reference['commit']} :")
+    for r in actuel:
+        avant = ref.get((r["scale"], r["stage"]))
+        if avant:
+            print(f"  {r['scale']:<7} {r['stage']:<28} x{avant / r['seconds']:6.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["small", "medium"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--excel", action="store_true", help="inclut la lecture Excel")
+    parser.add_argument("--compare", type=Path, help="résultats de référence (JSON)")
+    args = parser.parse_args()
+
+    resultats = []
+    for nom in args.scales:
+        resultats += run_scale(nom, SCALES[nom], args.repeat, args.excel)
+
+    commit = _commit()
+    sortie = {
+        "commit": commit,
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "cpus": os.cpu_count(),
+        "results": resultats,
+    }
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = RESULTS_DIR / f"{commit}.json"
+    path.write_text(json.dumps(sortie, indent=2), encoding="utf-8")
+    print(f"\nRésultats : {path}")
+
+    if args.compare:
+        comparer(resultats, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+# benchmarks/synthetic.py
+#
+# Générateur d'extractions synthétiques (pointages, BO facturation, efficience)
+# aux noms de colonnes exacts attendus par le code
+#   python -m benchmarks.synthetic --out data/synthetic --techniciens 300 \
+#       --jours 90 --factures 50000 --or 20000 --format xlsx
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from preprocessing.llti_preprocess import REQUIRED_COLS as COLONNES_BO
+from preprocessing.preprocess_productivite import REQUIRED_COLS as COLONNES_POINTAGE
+from preprocessing.schemas import SCHEMA_EFFICIENCE
+
+
+def _noms(prefixe: str, n: int) -> np.ndarray:
+    return np.array([f"{prefixe} {i:04d}" for i in range(n)], dtype=object)
+
+
+def pointages(n_tech: int = 200, n_jours: int = 90, lignes_par_jour: float = 2.0,
+              n_equipes: int = 12, debut: str = "2025-01-01", seed: int = 0) -> pd.DataFrame:
+    """
+    Extraction "3 mois glissants" : plusieurs lignes par technicien / jour,
+    Hr_Totale et Hr_Théorique répétés sur chaque ligne du jour
+    """
+    rng = np.random.default_rng(seed)
+    n = int(n_tech * n_jours * lignes_par_jour)
+
+    jours = pd.date_range(debut, periods=n_jours, freq="D")
+    tech = rng.integers(0, n_tech, size=n)
+    jour = rng.integers(0, n_jours, size=n)
+    weekday = jours.weekday.to_numpy()[jour]
+
+    # Valeurs journalières (dépendent uniquement du couple technicien / jour)
+    hr_theorique = np.where(weekday >= 5, 0.0, 8.0)
+    profil = (tech * 7 + jour * 3) % 10
+    hr_totale = np.select(
+        [profil == 0, profil <= 2, profil <= 7],
+        [0.0, 6.0, 8.0],
+        default=9.5
+    )
+    hr_totale = np.where((weekday >= 5) & (profil != 9), 0.0, hr_totale)
+
+    hr_trav = np.round(rng.uniform(0.5, 4.0, size=n), 2)
+
+    df = pd.DataFrame({
+        "Saisie heures - Date": jours.to_numpy()[jour],
+        "Salarié - Nom": _noms("TECH", n_tech)[tech],
+        "Equipe3": _noms("EQUIPE", n_equipes)[tech % n_equipes],
+        "Facturable": np.round(hr_trav * rng.uniform(0, 1, size=n), 2),
+        "Hr_travaillée": hr_trav,
+        "Hr_Totale": hr_totale,
+        "Hr_Théorique": hr_theorique,
+        "Jour_semaine": weekday,
+    })
+    return df[COLONNES_POINTAGE]
+
+
+def pointages_lignes(n_lignes: int, n_tech: int = 400, seed: int = 0) -> pd.DataFrame:
+    """
+    Variante dimensionnée en nombre de lignes brutes (benchmarks de débit)
+    """
+    lignes_par_jour = 3.0
+    n_jours = max(1, round(n_lignes / (n_tech * lignes_par_jour)))
+    return pointages(n_tech, n_jours, lignes_par_jour, seed=seed).iloc[:n_lignes]
+
+
+def bo(n_factures: int = 10_000, lignes_par_facture: float = 3.0,
+       debut: str | None = None, n_jours: int = 365,
+       part_caterpillar: float = 0.8, seed: int = 0) -> pd.DataFrame:
+    """
+    Export BO facturation : plusieurs lignes par facture, dates sur n_jours
+    jusqu'à aujourd'hui par défaut
+    """
+    rng = np.random.default_rng(seed)
+    n = int(n_factures * lignes_par_facture)
+
+    if debut is None:
+        debut = pd.Timestamp.today().normalize() - pd.Timedelta(days=n_jours)
+    debut = pd.Timestamp(debut)
+
+    facture = rng.integers(0, n_factures, size=n)
+    date_facture = debut + pd.to_timedelta(
+        (facture * 7919) % n_jours, unit="D"
+    )
+    delai = rng.gamma(2.0, 8.0, size=n).astype(int)
+    date_pointage = date_facture - pd.to_timedelta(delai, unit="D")
+
+    # Quelques lignes sans pointage ou avec date manquante
+    date_pointage = date_pointage.where(rng.random(n) > 0.02)
+
+    constructeur = np.where(
+        rng.random(n) < part_caterpillar,
+        rng.choice(["Caterpillar", "CATERPILLAR ", "caterpillar"], size=n),
+        rng.choice(["KOMATSU", "VOLVO", "SDMO"], size=n),
+    )
+
+    df = pd.DataFrame({
+        "N° OR (Segment)": 100_000 + facture // 2,
+        "N° Facture (Lignes)": 900_000 + facture,
+        "Date Facture (Lignes)": date_facture,
+        "Pointage dernière date (Segment)": date_pointage,
+        "Nom Client OR (or)": _noms("CLIENT", max(1, n_factures // 50))[facture % max(1, n_factures // 50)],
+        "Numéro série Equipement (Segment)": _noms("CAT", max(1, n_factures // 10))[facture % max(1, n_factures // 10)],
+        "Constructeur de l'équipement": constructeur,
+    })
+    return df[COLONNES_BO]
+
+
+def efficience(n_or: int = 5_000, n_tech: int = 200, n_equipes: int = 12,
+               seed: int = 0) -> pd.DataFrame:
+    """
+    Fichier Efficience consolidée (1 ligne = 1 OR)
+    """
+    rng = np.random.default_rng(seed)
+
+    tech = rng.integers(0, n_tech, size=n_or)
+    temps_ref = np.round(rng.uniform(1, 40, size=n_or), 1)
+    temps_bo = np.round(temps_ref * rng.lognormal(0, 0.4, size=n_or), 1)
+    temps_bo[rng.random(n_or) < 0.05] = 0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        eff = np.where(temps_bo > 0, temps_ref / temps_bo, np.nan)
+
+    df = pd.DataFrame({
+        "OR": 100_000 + np.arange(n_or),
+        "Nom Client OR (or)": _noms("CLIENT", max(1, n_or // 20))[rng.integers(0, max(1, n_or // 20), size=n_or)],
+        "Equipe": _noms("EQUIPE", n_equipes)[tech % n_equipes],
+        "Technicien": _noms("TECH", n_tech)[tech],
+        "Position": rng.choice(["EC", "FA", "CL"], size=n_or, p=[0.3, 0.5, 0.2]),
+        "Type OR": rng.choice(["Atelier", "Terrain", "Garantie", "PM"], size=n_or),
+        "Temps_reference": temps_ref,
+        "Temps_consomé_BO": temps_bo,
+        "Efficience_OR": np.round(eff, 3),
+        "Planifié ?": rng.choice(["Oui", "Non"], size=n_or),
+    })
+    return df[list(SCHEMA_EFFICIENCE)]
+
+
+def ecrire(df: pd.DataFrame, path: Path):
+    """
+    Écrit en .xlsx (comme les extractions réelles) ou .parquet
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_excel(path, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extractions synthétiques")
+    parser.add_argument("--out", default="data/synthetic")
+    parser.add_argument("--techniciens", type=int, default=200)
+    parser.add_argument("--jours", type=int, default=90)
+    parser.add_argument("--factures", type=int, default=10_000)
+    parser.add_argument("--or", dest="n_or", type=int, default=5_000)
+    parser.add_argument("--format", choices=["xlsx", "parquet"], default="xlsx")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    out = Path(args.out)
+    fichiers = {
+        "pointages": pointages(args.techniciens, args.jours, seed=args.seed),
+        "bo_facturation": bo(args.factures, seed=args.seed),
+        "efficience": efficience(args.n_or, args.techniciens, seed=args.seed),
+    }
+    for nom, df in fichiers.items():
+        path = out / f"{nom}.{args.format}"
+        ecrire(df, path)
+        print(f"{path} : {len(df):,} lignes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# kpis/debug_panel.py
+
+import os
+import sys
+
+import streamlit as st
+
+from preprocessing import profiling
+
+
+def debug_actif() -> bool:
+    """
+    Panneau debug : COPILOT_DEBUG=1 ou paramètre d'URL ?debug=1
+    """
+    return (
+        os.environ.get("COPILOT_DEBUG") == "1"
+        or st.query_params.get("debug") == "1"
+    )
+
+
+def render_debug_panel():
+    """
+    Profil des étapes du dernier affichage + compteurs des caches
+    """
+    with st.sidebar:
+        st.subheader("🛠️ Profilage")
+
+        records = profiling.records()
+        if records:
+            st.dataframe(
+                [
+                    {
+                        "Étape": "  " * r["depth"] + r["stage"],
+                        "ms": r["wall_ms"],
+                        "Pic Mo": r["peak_mb"],
+                        "Concurrente": "oui" if r.get("concurrent") else "",
+                        "Lignes in": r["rows_in"],
+                        "Lignes out": r["rows_out"],
+                    }
+                    for r in reversed(records[-50:])
+                ],
+                use_container_width=True
+            )
+        else:
+            st.caption("Aucune étape mesurée pour le moment.")
+
+        # Importé seulement si une page KPI l'a déjà chargé (accueil léger)
+        ingestion = sys.modules.get("preprocessing.ingestion")
+        if ingestion is not None:
+            st.caption("Cache d’ingestion")
+            st.json(ingestion.ingestion_stats())
+
+        memo = sys.modules.get("preprocessing.memo")
+        if memo is not None:
+            st.caption("Artefacts mémoïsés (version × filtres)")
+            st.json(memo.memo_stats())
+
+        col1, col2 = st.columns(2)
+        col1.download_button(
+            "Exporter JSON",
+            profiling.export_json(),
+            file_name="profil_copilote.json",
+            mime="application/json"
+        )
+        if col2.button("Vider"):
+            profiling.clear()
@@ -1,5 +1,16 @@
 import streamlit as st
-import pandas as pd
+
+from preprocessing.ingestion import files_digest
+from preprocessing.parallel_ingest import ingest_efficience
+from preprocessing.efficience_filters import filtre_index_for
+from preprocessing.efficience_synthese import AXES, build_synthese
+from preprocessing.kpi_engine import kpis_efficience, table_encours
+from preprocessing.kpi_store import enregistrer_kpi
+from preprocessing.memo import memo
+
+
+TAILLE_PAGE = 50
+
 
 def page_efficience():
 
@@ -15,19 +26,34 @@ def page_efficience():
     st.divider()
 
     # ===============================
-    # UPLOAD UNIQUE
+    # UPLOAD (un ou plusieurs fichiers)
     # ===============================
-    uploaded_file = st.file_uploader(
+    uploaded_files = st.file_uploader(
         "Charger le fichier Efficience consolidée (Power Query)",
         type=["xlsx"],
+        accept_multiple_files=True,
         key="efficience_upload"
     )
 
-    if not uploaded_file:
+    if not uploaded_files:
         st.info("Veuillez charger le fichier d’efficience consolidée.")
         return
 
-    df = pd.read_excel(uploaded_file)
+    df = ingest_efficience(uploaded_files)
+
+    # Index de filtrage (catégories + bitmaps), construit une fois par lot
+    version = files_digest(uploaded_files)
+    index = filtre_index_for(version, df)
+
+    # Sauvegarde pour page Accueil (périmètre complet, hors filtres)
+    enregistrer_kpi(
+        "efficience_moyenne",
+        memo(
+            "efficience_globale", version, (),
+            lambda: index.filtrer({}, "exploitable")["Efficience_OR"].mean()
+        ),
+        source="page"
+    )
 
     # ===============================
     # FILTRES GLOBAUX
@@ -37,26 +63,28 @@ def page_efficience():
     col1, col2, col3 = st.columns(3)
 
     with col1:
-        equipes = sorted(df["Equipe"].dropna().unique())
+        equipes = index.valeurs["Equipe"]
         equipe_sel = st.multiselect("Équipe", equipes, default=equipes)
 
     with col2:
-        positions = sorted(df["Position"].dropna().unique())
+        positions = index.valeurs["Position"]
         position_sel = st.multiselect("Statut OR", positions, default=positions)
 
     with col3:
-        types_or = sorted(df["Type OR"].dropna().unique())
+        types_or = index.valeurs["Type OR"]
         type_or_sel = st.multiselect("Type OR", types_or, default=types_or)
 
-    # Application filtres
-    df_f = df.copy()
-
-    if equipe_sel:
-        df_f = df_f[df_f["Equipe"].isin(equipe_sel)]
-    if position_sel:
-        df_f = df_f[df_f["Position"].isin(position_sel)]
-    if type_or_sel:
-        df_f = df_f[df_f["Type OR"].isin(type_or_sel)]
+    # Application filtres (intersection de bitmaps, sans copie du DF)
+    selections = {
+        "Equipe": equipe_sel,
+        "Position": position_sel,
+        "Type OR": type_or_sel,
+    }
+    # Mémoïsé par (version, sélections) : KPI globaux + tableau encours
+    kpis = memo(
+        "kpis_efficience", version, (selections,),
+        lambda: kpis_efficience(index, selections)
+    )
 
     st.divider()
 
@@ -65,31 +93,72 @@ def page_efficience():
     # ===============================
     st.subheader("Indicateurs globaux")
 
-    df_eff = df_f[df_f["Efficience_OR"].notna()]
-
     col1, col2, col3 = st.columns(3)
 
     with col1:
         st.metric(
             "Efficience moyenne",
-            f"{df_eff['Efficience_OR'].mean():.2f}"
+            f"{kpis['efficience_moyenne']:.2f}",
+            help=f"Pondérée par le temps : {kpis['efficience_ponderee']:.2f}"
         )
 
     with col2:
         st.metric(
             "OR exploitables",
-            f"{len(df_eff)} / {len(df_f)}"
+            f"{kpis['or_exploitables']} / {kpis['or_filtres']}"
         )
 
     with col3:
-        part_encours = (
-            len(df_f[df_f["Position"] == "EC"]) / len(df_f)
-            if len(df_f) > 0 else 0
-        )
         st.metric(
             "Part OR encours",
-            f"{part_encours:.1%}"
+            f"{kpis['part_encours']:.1%}"
+        )
+
+    st.divider()
+
+    # ===============================
+    # COACHING (synthèse par équipe / technicien / type OR)
+    # ===============================
+    st.subheader("👥 Synthèse par équipe, technicien et type d’OR")
+
+    # Construite une fois par lot chargé (périmètre complet, hors filtres)
+    synthese = memo("efficience_synthese", version, (), lambda: build_synthese(index.df))
+
+    axe = st.radio(
+        "Regrouper par",
+        list(AXES),
+        format_func={"equipe": "Équipe", "technicien": "Technicien", "type_or": "Type OR"}.get,
+        horizontal=True
+    )
+    table = synthese[axe]
+
+    # Fiche technicien : pas de sélection possible si aucun technicien renseigné
+    if axe == "technicien" and not table.empty:
+        tech = st.selectbox("Technicien", table["Technicien"].sort_values())
+        ligne = table[table["Technicien"] == tech].iloc[0]
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Efficience pondérée", f"{ligne['Efficience pondérée']:.2f}")
+        col2.metric(
+            "Médiane (P10 – P90)",
+            f"{ligne['Efficience médiane']:.2f}",
+            help=f"{ligne['Efficience P10']:.2f} – {ligne['Efficience P90']:.2f}"
         )
+        col3.metric("OR", f"{ligne['OR']}")
+
+    # Format par colonne (pas de Styler : rapide même pour des centaines de lignes)
+    st.dataframe(
+        table,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            col: st.column_config.NumberColumn(format="%.2f")
+            for col in table.columns[table.columns.str.startswith("Efficience")]
+        } | {
+            col: st.column_config.NumberColumn(format="%.1f")
+            for col in ["Temps référence", "Temps consommé"]
+        }
+    )
 
     st.divider()
 
@@ -98,21 +167,31 @@ def page_efficience():
     # ===============================
     st.subheader("🎯 OR encours – Actions prioritaires")
 
-    encours = df_eff[df_eff["Position"] == "EC"]
+    # Classement pré-calculé (mémoïsé par filtres) : seule la page affichée
+    # est matérialisée, et mise en forme si demandé
+    lignes = kpis["encours_lignes"]
+    if len(lignes) == 0:
+        st.info("Aucun OR encours pour ce périmètre.")
+        return
+
+    n_pages = max(1, -(-len(lignes) // TAILLE_PAGE))
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        num_page = st.number_input(
+            f"Page (sur {n_pages}) – {len(lignes)} OR encours, "
+            "efficience la plus faible en premier",
+            min_value=1,
+            max_value=n_pages,
+            value=1
+        )
+    with col2:
+        mise_en_forme = st.toggle("Mise en forme", value=True)
+
+    debut = (num_page - 1) * TAILLE_PAGE
+    page = table_encours(index, lignes[debut:debut + TAILLE_PAGE])
 
     st.dataframe(
-        encours[
-            [
-                "OR",
-                "Nom Client OR (or)",
-                "Equipe",
-                "Technicien",
-                "Temps_reference",
-                "Temps_consomé_BO",
-                "Efficience_OR",
-                "Planifié ?"
-            ]
-        ]
-        .sort_values("Efficience_OR")
-        .style.format({"Efficience_OR": "{:.2f}"})
+        page.style.format({"Efficience_OR": "{:.2f}"}) if mise_en_forme else page,
+        use_container_width=True
     )
@@ -0,0 +1,129 @@
+# kpis/exhaustivite_heatmap.py
+
+import hashlib
+import io
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from matplotlib.figure import Figure
+
+from preprocessing.cache import LRUCache
+from preprocessing.exhaustivite_preprocessing import (
+    LIBELLES,
+    STATUTS,
+    ExhaustiviteMois,
+)
+from preprocessing.profiling import profiled
+
+
+# ==================================================
+# COULEURS PAR STATUT
+# ==================================================
+COULEURS_STATUTS = {
+    "Non conforme": "#d73027",
+    "Incomplet": "#fee08b",
+    "Conforme": "#1a9850",
+    "Surpointage": "#4575b4",
+    "Weekend OK": "#f0f0f0",
+    "Travail weekend": "#984ea3",
+    "": "#ffffff",
+}
+
+# LUT indexée par code statut ; le code STATUT_ABSENT (-1) tombe sur la
+# dernière ligne (blanc)
+LUT_RGB = np.array(
+    [list(bytes.fromhex(COULEURS_STATUTS[s].lstrip("#"))) for s in LIBELLES],
+    dtype=np.uint8
+)
+
+# Au-delà : graphique interactif natif plutôt qu'une image matplotlib
+SEUIL_INTERACTIF = 80
+
+_images = LRUCache(max_entries=16, max_bytes=64 * 1024 * 1024)
+
+
+def grille_rgb(codes: np.ndarray) -> np.ndarray:
+    """
+    Matrice de codes (n_tech, n_jours) -> image RGB uint8 en une passe
+    """
+    return LUT_RGB[codes]
+
+
+@profiled("render.exhaustivite_png")
+def _render_png(data: ExhaustiviteMois) -> bytes:
+    n_tech = len(data.techniciens)
+
+    fig = Figure(figsize=(10, min(max(4, n_tech * 0.3), 20)))
+    ax = fig.subplots()
+
+    ax.imshow(grille_rgb(data.codes), aspect="auto", interpolation="nearest")
+
+    ax.set_xticks(range(len(data.jours)))
+    ax.set_xticklabels(data.jours)
+    ax.set_yticks(range(n_tech))
+    ax.set_yticklabels(data.techniciens)
+
+    ax.set_xlabel("Jour du mois")
+    ax.set_ylabel("Techniciens")
+    ax.set_title(f"Exhaustivité – {data.mois}")
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=100, bbox_inches="tight")
+    return buffer.getvalue()
+
+
+def heatmap_png(data: ExhaustiviteMois, equipes_sel) -> bytes:
+    """
+    Image PNG de la grille, mise en cache par (mois, sélection d'équipes)
+    """
+    key = (
+        data.mois,
+        tuple(sorted(equipes_sel)),
+        hashlib.blake2b(data.codes.tobytes(), digest_size=16).hexdigest(),
+        data.codes.shape,
+    )
+    return _images.get_or_compute(key, lambda: _render_png(data))
+
+
+def _vega_spec(data: ExhaustiviteMois) -> tuple[pd.DataFrame, dict]:
+    cells = data.cellules()
+
+    spec = {
+        "mark": "rect",
+        "height": {"step": 14},
+        "encoding": {
+            "x": {"field": "Jour", "type": "ordinal", "title": "Jour du mois"},
+            "y": {"field": "Technicien", "type": "nominal", "title": "Techniciens"},
+            "color": {
+                "field": "Statut",
+                "type": "nominal",
+                "scale": {
+                    "domain": list(STATUTS),
+                    "range": [COULEURS_STATUTS[s] for s in STATUTS],
+                },
+            },
+            "tooltip": [
+                {"field": "Technicien"},
+                {"field": "Jour"},
+                {"field": "Statut"},
+                {"field": "Heures", "format": ".1f"},
+            ],
+        },
+    }
+    return cells, spec
+
+
+def render_heatmap(data: ExhaustiviteMois, equipes_sel, interactif: bool | None = None):
+    """
+    Affiche la grille d'exhaustivité
+    - interactif=None : mode choisi selon la taille de l'équipe
+    """
+    if interactif is None:
+        interactif = len(data.techniciens) > SEUIL_INTERACTIF
+
+    if interactif:
+        cells, spec = _vega_spec(data)
+        st.vega_lite_chart(cells, spec, use_container_width=True)
+    else:
+        st.image(heatmap_png(data, equipes_sel), use_container_width=True)
@@ -0,0 +1,34 @@
+# kpis/job_status.py
+
+import streamlit as st
+
+from preprocessing.background_jobs import Job
+
+
+@st.fragment(run_every=0.5)
+def suivre_job(job: Job):
+    """
+    Progression d'un job en arrière-plan ; relance la page à sa fin pour
+    afficher le nouveau résultat
+    """
+    if job.termine():
+        st.rerun()
+
+    st.progress(job.progres, text=f"{job.message} ({job.duree():.0f} s)")
+
+
+def resultat_courant(nom: str, job: Job):
+    """
+    Dernier résultat terminé (clé, valeur) pour la page `nom`
+    - Conservé pendant le calcul d'une nouvelle version
+    - Lève l'erreur du job si le dernier calcul a échoué
+    """
+    if job.termine():
+        erreur = job.erreur()
+        if erreur is not None:
+            raise erreur
+        st.session_state[f"{nom}_resultat"] = (job.key, job.resultat())
+    else:
+        suivre_job(job)
+
+    return st.session_state.get(f"{nom}_resultat")
@@ -1,9 +1,45 @@
 # kpis/llti.py
 
+import numpy as np
 import streamlit as st
 import pandas as pd
 
-from preprocessing.llti_preprocess import preprocess_llti
+from preprocessing.background_jobs import relancer
+from preprocessing.llti_preprocess import MODES_LLTI, debut_trimestre, finaliser_llti
+from preprocessing.ingestion import files_digest, read_bytes
+from preprocessing.parallel_ingest import ingest_bo
+from preprocessing.llti_index import (
+    index_available,
+    load_index,
+    query_llti,
+    tendance_llti,
+    update_index,
+)
+from preprocessing.kpi_engine import kpis_llti
+from preprocessing.llti_groupes import AXES, agreger_llti
+from preprocessing.kpi_store import enregistrer_kpi
+from preprocessing.memo import memo
+from kpis.job_status import resultat_courant
+
+
+TAILLE_PAGE = 100
+
+
+def _ordre_lents(df_llti: pd.DataFrame) -> np.ndarray:
+    # Factures de la plus lente à la plus rapide (tri stable sur entiers)
+    return np.argsort(-df_llti["LLTI_jours"].to_numpy(), kind="stable")
+
+
+def _preparer(datas: list[bytes], debut, mode: str, progression):
+    """
+    Lecture en flux + déduplication (exécutées en arrière-plan)
+    """
+    df_bo = ingest_bo(
+        datas, debut,
+        progression=lambda f, message=None: progression(0.9 * f, message)
+    )
+    progression(0.95, "Calcul du LLTI…")
+    return finaliser_llti(df_bo, mode)
 
 
 def page_llti():
@@ -19,26 +55,57 @@ def page_llti():
     # ==================================================
     # UPLOAD BO
     # ==================================================
-    uploaded_file = st.file_uploader(
+    uploaded_files = st.file_uploader(
         "Charger le fichier BO – Facturation Service",
-        type=["xlsx"],
+        type=["xlsx", "csv"],
+        accept_multiple_files=True,
         key="llti_bo_upload"
     )
 
-    if not uploaded_file:
+    if not uploaded_files:
         st.info("Veuillez charger le fichier BO pour analyser le LLTI.")
         return
 
     # ==================================================
     # LECTURE + PREPROCESSING
     # ==================================================
+    # Lecture en flux (en arrière-plan) : seules les lignes du trimestre en
+    # cours sont gardées ; le dernier résultat reste affiché pendant le calcul
+    debut = debut_trimestre()
+    digest = files_digest(uploaded_files)
+    datas = [read_bytes(f) for f in uploaded_files]
+
+    mode = st.radio(
+        "Unité du LLTI",
+        list(MODES_LLTI),
+        format_func=MODES_LLTI.get,
+        horizontal=True,
+        help="Jours ouvrés : hors week-ends et jours fériés du Sénégal"
+    )
+
+    job = relancer(
+        st.session_state.get("llti_job"),
+        (digest, debut, mode),
+        lambda progression: _preparer(datas, debut, mode, progression)
+    )
+    st.session_state.llti_job = job
+
     try:
-        df_bo = pd.read_excel(uploaded_file)
+        courant = resultat_courant("llti", job)
     except Exception as e:
         st.error(f"Erreur de lecture du fichier : {e}")
         return
 
-    df_llti = preprocess_llti(df_bo)
+    if courant is None:
+        return
+
+    # Unité et période du résultat affiché, qui peut encore être celui du
+    # calcul précédent (ex. jours calendaires pendant le recalcul en ouvrés)
+    version, df_llti = courant
+    _, debut_resultat, mode_resultat = version
+    unite = MODES_LLTI[mode_resultat].lower()
+    if not job.termine():
+        st.caption("Résultat précédent affiché – recalcul en cours.")
 
     if df_llti.empty:
         st.warning("Aucune facture exploitable sur le trimestre en cours.")
@@ -47,28 +114,37 @@ def page_llti():
     # ==================================================
     # KPI GLOBAL
     # ==================================================
-    llti_moyen = df_llti["LLTI_jours"].mean()
-    llti_mediane = df_llti["LLTI_jours"].median()
-    nb_factures = df_llti["N° Facture (Lignes)"].nunique()
+    kpis = memo("kpis_llti", version, (), lambda: kpis_llti(df_llti))
+
+    # Sauvegarde pour page Accueil (avec l'unité : calendaires ou ouvrés)
+    enregistrer_kpi(
+        "llti_moyen",
+        kpis["llti_moyen"],
+        periode=f"T{debut_resultat.quarter} {debut_resultat.year}",
+        unite=mode_resultat,
+        source="page"
+    )
 
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4 = st.columns(4)
 
-    col1.metric("LLTI moyen (jours)", f"{llti_moyen:.1f}")
-    col2.metric("LLTI médian (jours)", f"{llti_mediane:.0f}")
-    col3.metric("Factures analysées", f"{nb_factures}")
+    col1.metric(f"LLTI moyen ({unite})", f"{kpis['llti_moyen']:.1f}")
+    col2.metric(f"LLTI médian ({unite})", f"{kpis['llti_mediane']:.0f}")
+    col3.metric(
+        f"P90 / P95 ({unite})",
+        f"{kpis['llti_p90']:.0f} / {kpis['llti_p95']:.0f}"
+    )
+    col4.metric("Factures analysées", f"{kpis['nb_factures']}")
 
     st.divider()
 
     # ==================================================
     # DISTRIBUTION
     # ==================================================
-    st.subheader("Distribution du LLTI (jours)")
+    st.subheader(f"Distribution du LLTI ({unite})")
 
-    st.bar_chart(
-        df_llti["LLTI_jours"]
-        .value_counts()
-        .sort_index()
-    )
+    # Classes de 7 jours au-delà d'un semestre de LLTI max
+    largeur = 7 if kpis["stats"].max > 180 else 1
+    st.bar_chart(kpis["stats"].distribution(largeur))
 
     st.divider()
 
@@ -77,11 +153,98 @@ def page_llti():
     # ==================================================
     st.subheader("Détail LLTI – Facture par facture")
 
-    df_display = df_llti.sort_values(
-        "LLTI_jours", ascending=False
+    # Pages de TAILLE_PAGE factures, des plus lentes aux plus rapides : seule
+    # la page affichée est matérialisée
+    ordre = memo("llti_ordre", version, (), lambda: _ordre_lents(df_llti))
+    n_pages = max(1, -(-len(ordre) // TAILLE_PAGE))
+
+    num_page = st.number_input(
+        f"Page (sur {n_pages}) – {TAILLE_PAGE} factures par page",
+        min_value=1,
+        max_value=n_pages,
+        value=1
     )
+    debut_page = (num_page - 1) * TAILLE_PAGE
 
     st.dataframe(
-        df_display,
+        df_llti.take(ordre[debut_page:debut_page + TAILLE_PAGE]),
         use_container_width=True
     )
+
+    st.divider()
+
+    # ==================================================
+    # VENTILATION (client / équipement / OR)
+    # ==================================================
+    st.subheader("🔎 LLTI par client, équipement et OR")
+
+    axe = st.radio(
+        "Ventilation",
+        list(AXES),
+        format_func={"client": "Client", "equipement": "Équipement", "or": "OR"}.get,
+        horizontal=True
+    )
+
+    # Calculée une fois par (jeu de données, axe)
+    groupes = memo("llti_groupes", version, (axe,), lambda: agreger_llti(df_llti, axe))
+
+    st.dataframe(
+        groupes.head(TAILLE_PAGE).style.format({
+            "LLTI moyen": "{:.1f}",
+            "LLTI médian": "{:.0f}",
+            "LLTI P90": "{:.0f}",
+            "LLTI max": "{:.0f}",
+        }),
+        use_container_width=True
+    )
+    st.caption(
+        f"{min(TAILLE_PAGE, len(groupes))} premiers groupes sur {len(groupes)}, "
+        "par LLTI moyen décroissant."
+    )
+
+    # ==================================================
+    # HISTORIQUE (index persistant des factures)
+    # ==================================================
+    if not index_available():
+        return
+
+    st.divider()
+    st.subheader(f"📈 Historique LLTI ({unite})")
+
+    if st.session_state.get("llti_historise") != digest:
+        if st.button("Intégrer ces fichiers à l’historique (toutes périodes)"):
+            df_all = ingest_bo(uploaded_files, None)
+            maj = update_index(df_all)
+            st.session_state.llti_historise = digest
+            st.success(
+                f"{maj['nouvelles']} nouvelles factures, "
+                f"{maj['modifiees']} modifiées – {maj['total']} au total"
+            )
+
+    index = load_index()
+    if index.empty:
+        st.info("Aucune facture historisée pour le moment.")
+        return
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        freq = st.radio(
+            "Granularité",
+            ["Q", "M"],
+            format_func={"Q": "Trimestre", "M": "Mois"}.get,
+            horizontal=True
+        )
+        st.dataframe(
+            tendance_llti(freq, index=index, mode=mode_resultat),
+            use_container_width=True
+        )
+
+    with col2:
+        fenetre = st.selectbox("Fenêtre glissante (jours)", [30, 90, 180, 365], index=1)
+        df_fenetre = query_llti(fenetre_jours=fenetre, index=index, mode=mode_resultat)
+        st.metric(
+            f"LLTI moyen ({unite}) – {fenetre} derniers jours",
+            f"{df_fenetre['LLTI_jours'].mean():.1f}" if len(df_fenetre) else "—"
+        )
+        st.metric("Factures", f"{len(df_fenetre)}")
@@ -1,12 +1,68 @@
 # kpis/productivite.py
 
+import io
+
 import streamlit as st
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
-from preprocessing.productivite_preprocessing import preprocess_productivite
+from preprocessing.background_jobs import relancer
 from preprocessing.exhaustivite_preprocessing import compute_exhaustivite
+from preprocessing.ingestion import files_digest, read_bytes
+from preprocessing.parallel_ingest import ingest_pointages
+from preprocessing.productivite_cube import cube_for
+from preprocessing.kpi_engine import kpis_productivite, productivite_annee
+from preprocessing.kpi_store import enregistrer_kpi
+from preprocessing.memo import memo
+from preprocessing.profiling import stage
+from preprocessing.pointage_warehouse import (
+    append_pointages,
+    load_pointages,
+    productivite_ytd,
+    version_entrepot,
+    warehouse_available,
+)
+from kpis.exhaustivite_heatmap import SEUIL_INTERACTIF, render_heatmap
+from kpis.job_status import resultat_courant
+
+
+def _tendance_png(prod_jour: pd.DataFrame) -> bytes:
+    fig, ax = plt.subplots(figsize=(10, 4))
+    sns.lineplot(
+        data=prod_jour,
+        x="Saisie heures - Date",
+        y="Productivité",
+        marker="o",
+        ax=ax
+    )
+
+    ax.set_ylabel("Productivité")
+    ax.set_xlabel("Date")
+    ax.set_title("Tendance journalière – Productivité")
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=100, bbox_inches="tight")
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def _preparer(datas: list[bytes], digest: str, progression):
+    """
+    Ingestion, historisation et cube (exécutés en arrière-plan)
+    """
+    df = ingest_pointages(
+        datas,
+        progression=lambda f, message=None: progression(0.8 * f, message)
+    )
+
+    if warehouse_available() and not df.empty:
+        progression(0.85, "Historisation…")
+        append_pointages(df)
+
+    progression(0.9, "Agrégation…")
+    cube_for((digest, False), df)
+    return df
 
 
 def page_productivite():
@@ -23,34 +79,75 @@ def page_productivite():
     # ==================================================
     # UPLOAD
     # ==================================================
-    uploaded_file = st.file_uploader(
-        "Charger l’extraction 3 mois glissants (Pointages Service)",
+    uploaded_files = st.file_uploader(
+        "Charger les extractions 3 mois glissants (Pointages Service)",
         type=["xlsx"],
+        accept_multiple_files=True,
         key="productivite_upload"
     )
-    for c in df.columns:
-        print(f"'{c}'")
-
 
-    if not uploaded_file:
+    if not uploaded_files:
         st.info("Veuillez charger le fichier d’extraction.")
         return
 
-    df_raw = pd.read_excel(uploaded_file)
-
     # ==================================================
-    # PREPROCESSING
+    # LECTURE + PREPROCESSING (en arrière-plan, un worker par fichier)
     # ==================================================
+    # Le dernier résultat reste affiché pendant le calcul d'un nouveau lot ;
+    # un nouvel upload annule le calcul devenu obsolète
+    digest = files_digest(uploaded_files)
+    datas = [read_bytes(f) for f in uploaded_files]
+
+    job = relancer(
+        st.session_state.get("productivite_job"),
+        digest,
+        lambda progression: _preparer(datas, digest, progression)
+    )
+    st.session_state.productivite_job = job
+
     try:
-        df = preprocess_productivite(df_raw)
+        courant = resultat_courant("productivite", job)
     except Exception as e:
         st.error(f"Erreur preprocessing : {e}")
         return
 
+    if courant is None:
+        return
+
+    digest, df = courant
+    if not job.termine():
+        st.caption("Résultat précédent affiché – recalcul en cours.")
+
     if df.empty:
         st.warning("Aucune donnée exploitable.")
         return
 
+    # ==================================================
+    # HISTORISATION (entrepôt local multi-mois)
+    # ==================================================
+    historique = False
+    ytd = None
+
+    if warehouse_available():
+        ytd = productivite_ytd()
+        if ytd is not None:
+            st.metric("Productivité YTD (historique)", f"{ytd:.1%}")
+
+        historique = st.toggle(
+            "Inclure l’historique",
+            value=False,
+            help="Analyse tous les mois déjà chargés, pas seulement l’extraction"
+        )
+
+    # Cube pré-agrégé : construit une fois par jeu de données ; l'historique
+    # est versionné par le contenu de l'entrepôt (réécrit à chaque ingestion)
+    version = (digest, False)
+    if historique:
+        version = version_entrepot()
+        df = load_pointages()
+
+    cube = cube_for(version, df)
+
     # ==================================================
     # FILTRES
     # ==================================================
@@ -59,7 +156,7 @@ def page_productivite():
     col1, col2 = st.columns(2)
 
     with col1:
-        equipes = sorted(df["Salarié - Equipe(Nom)"].unique())
+        equipes = list(cube.labels["Equipe3"])
         equipes_sel = st.multiselect(
             "Équipes",
             equipes,
@@ -67,22 +164,21 @@ def page_productivite():
         )
 
     with col2:
-        mois = sorted(df["Mois"].unique())
+        mois = list(cube.labels["Mois"])
         mois_sel = st.selectbox(
             "Mois analysé",
             mois,
             index=len(mois) - 1
         )
 
-    df = df[
-        (df["Salarié - Equipe(Nom)"].isin(equipes_sel)) &
-        (df["Mois"] == mois_sel)
-    ]
-
-    if df.empty:
+    if len(cube.selection(mois_sel, equipes_sel)) == 0:
         st.warning("Aucune donnée pour ces filtres.")
         return
 
+    # Artefacts mémoïsés par (version des données, filtres) : revenir sur une
+    # sélection déjà vue ne recalcule rien
+    filtres = (mois_sel, equipes_sel)
+
     st.divider()
 
     # ==================================================
@@ -90,49 +186,21 @@ def page_productivite():
     # ==================================================
     st.subheader("🗓️ Exhaustivité des pointages")
 
-    exhaustivite = compute_exhaustivite(df)
-
-    data_exh = exhaustivite.get(mois_sel)
-
-    if data_exh:
-        techs = list(data_exh["statuts"].keys())
-
-        fig, ax = plt.subplots(
-            figsize=(max(10, len(techs) * 0.6), 6)
-        )
+    data_exh = memo(
+        "exhaustivite", version, filtres,
+        lambda: compute_exhaustivite(
+            df[df["Equipe3"].isin(equipes_sel) & (df["Mois"] == mois_sel)]
+        ).get(mois_sel)
+    )
 
-        # Mapping couleurs
-        color_map = {
-            "Non conforme": "#d73027",
-            "Incomplet": "#fee08b",
-            "Conforme": "#1a9850",
-            "Surpointage": "#4575b4",
-            "Weekend OK": "#f0f0f0",
-            "Travail weekend": "#984ea3",
-            "": "#ffffff"
-        }
-
-        pivot = pd.DataFrame(data_exh["statuts"]).T
-        color_df = pivot.applymap(lambda x: color_map.get(x, "#ffffff"))
-
-        ax.imshow(
-            color_df.applymap(
-                lambda c: plt.colors.to_rgb(c)
-                if c != "#ffffff" else (1, 1, 1)
-            ).values,
-            aspect="auto"
+    if data_exh is not None:
+        interactif = st.toggle(
+            "Vue interactive",
+            value=len(data_exh.techniciens) > SEUIL_INTERACTIF,
+            help="Recommandée pour les grandes équipes"
         )
-
-        ax.set_xticks(range(len(pivot.columns)))
-        ax.set_xticklabels(pivot.columns)
-        ax.set_yticks(range(len(pivot.index)))
-        ax.set_yticklabels(pivot.index)
-
-        ax.set_xlabel("Jour du mois")
-        ax.set_ylabel("Techniciens")
-        ax.set_title(f"Exhaustivité – {mois_sel}")
-
-        st.pyplot(fig)
+        with stage("render.exhaustivite"):
+            render_heatmap(data_exh, equipes_sel, interactif=interactif)
 
     else:
         st.info("Exhaustivité indisponible.")
@@ -142,15 +210,20 @@ def page_productivite():
     # ==================================================
     # 2️⃣ PRODUCTIVITÉ GLOBALE
     # ==================================================
-    total_fact = df["Facturable"].sum()
-    total_trav = df["Hr_Totale"].sum()
-    prod_globale = total_fact / total_trav if total_trav > 0 else 0
+    kpis = memo(
+        "kpis_productivite", version, filtres,
+        lambda: kpis_productivite(cube, mois_sel, equipes_sel)
+    )
+    prod_globale = kpis["productivite_globale"]
 
     st.metric("Productivité globale", f"{prod_globale:.1%}")
 
-    # Sauvegarde pour page Accueil
-    st.session_state.productivite_globale = prod_globale
-    st.session_state.productivite_calculee = True
+    # Sauvegarde pour page Accueil (YTD : entrepôt, sinon extraction chargée)
+    enregistrer_kpi(
+        "productivite_ytd",
+        ytd if ytd is not None else productivite_annee(cube),
+        source="page"
+    )
 
     st.divider()
 
@@ -159,22 +232,7 @@ def page_productivite():
     # ==================================================
     st.subheader("Productivité par technicien")
 
-    prod_tech = (
-        df.groupby("Salarié - Nom")
-        .agg(
-            Heures=("Hr_Totale", "sum"),
-            Facturable=("Facturable", "sum")
-        )
-        .reset_index()
-    )
-
-    prod_tech["Productivité"] = (
-        prod_tech["Facturable"] / prod_tech["Heures"]
-    )
-
-    prod_tech = prod_tech.sort_values(
-        "Productivité", ascending=False
-    )
+    prod_tech = kpis["prod_tech"]
 
     st.dataframe(
         prod_tech.style.format({
@@ -192,30 +250,10 @@ def page_productivite():
     # ==================================================
     st.subheader("Évolution journalière de la productivité")
 
-    prod_jour = (
-        df.groupby("Saisie heures - Date")
-        .agg(
-            Heures=("Hr_Totale", "sum"),
-            Facturable=("Facturable", "sum")
-        )
-        .reset_index()
-    )
-
-    prod_jour["Productivité"] = (
-        prod_jour["Facturable"] / prod_jour["Heures"]
-    )
-
-    fig, ax = plt.subplots(figsize=(10, 4))
-    sns.lineplot(
-        data=prod_jour,
-        x="Saisie heures - Date",
-        y="Productivité",
-        marker="o",
-        ax=ax
-    )
-
-    ax.set_ylabel("Productivité")
-    ax.set_xlabel("Date")
-    ax.set_title("Tendance journalière – Productivité")
+    prod_jour = kpis["prod_jour"]
 
-    st.pyplot(fig)
+    with stage("render.tendance_jour", rows_in=prod_jour):
+        st.image(memo(
+            "tendance_jour", version, filtres,
+            lambda: _tendance_png(prod_jour)
+        ))
@@ -0,0 +1,121 @@
+# preprocessing/background_jobs.py
+
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+# ==================================================
+# CALCULS EN ARRIÈRE-PLAN (ingestion / agrégation lourdes)
+# ==================================================
+# Threads : le script Streamlit n'est pas bloqué, le parsing lui-même reste
+# réparti sur le pool de processus de parallel_ingest
+MAX_JOBS = int(os.environ.get("COPILOT_BACKGROUND_JOBS", 2))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# Job exécuté par le thread courant (vérification d'annulation au fil des étapes)
+_courant = threading.local()
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=MAX_JOBS,
+                thread_name_prefix="copilot-job"
+            )
+        return _executor
+
+
+class JobAnnule(Exception):
+    """
+    Levée dans le job par `progression` quand il a été remplacé
+    """
+
+
+class Job:
+    """
+    Calcul lancé en arrière-plan
+    - `key` : version des données calculées (ex. hash des fichiers)
+    - Progression (0 → 1) et message mis à jour par le job lui-même
+    - Annulation coopérative : vérifiée à chaque appel de `progression`
+      et par `verifier_annulation` entre les étapes des tâches
+    """
+
+    def __init__(self, key, compute):
+        self.key = key
+        self.progres = 0.0
+        self.message = "En attente…"
+        self.debut = time.monotonic()
+        self._annule = threading.Event()
+        # Contexte de la session copié dans le job (ex. profilage debug)
+        self._future = _pool().submit(
+            contextvars.copy_context().run, self._run, compute
+        )
+
+    def _run(self, compute):
+        _courant.job = self
+        try:
+            self.progression(0.0, "Démarrage…")
+            return compute(self.progression)
+        finally:
+            _courant.job = None
+
+    def progression(self, fraction: float, message: str | None = None):
+        if self._annule.is_set():
+            raise JobAnnule(self.key)
+        self.progres = min(max(float(fraction), 0.0), 1.0)
+        if message is not None:
+            self.message = message
+
+    def annuler(self):
+        self._annule.set()
+        self._future.cancel()
+
+    @property
+    def annule(self) -> bool:
+        return self._annule.is_set()
+
+    def termine(self) -> bool:
+        return self._future.done()
+
+    def erreur(self) -> BaseException | None:
+        if not self.termine() or self._future.cancelled():
+            return None
+        return self._future.exception()
+
+    def resultat(self):
+        return self._future.result()
+
+    def duree(self) -> float:
+        return time.monotonic() - self.debut
+
+
+def verifier_annulation():
+    """
+    Lève JobAnnule si le job du thread courant a été remplacé
+    - Sans effet hors job (appel direct, worker de processus)
+    """
+    job = getattr(_courant, "job", None)
+    if job is not None and job.annule:
+        raise JobAnnule(job.key)
+
+
+def relancer(job: Job | None, key, compute) -> Job:
+    """
+    Job à jour pour `key` : le job courant s'il calcule déjà cette version,
+    sinon un nouveau job (le précédent, devenu obsolète, est annulé)
+    - Un job en échec est relancé (erreur transitoire : fichier verrouillé,
+      worker interrompu…)
+    """
+    echec = job is not None and job.termine() and job.erreur() is not None
+    if job is not None and job.key == key and not job.annule and not echec:
+        return job
+    if job is not None:
+        job.annuler()
+    return Job(key, compute)
@@ -0,0 +1,148 @@
+# preprocessing/bo_stream.py
+
+import io
+from itertools import islice
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from preprocessing.background_jobs import verifier_annulation
+from preprocessing.llti_preprocess import REQUIRED_COLS, filtrer_bo
+from preprocessing.profiling import profiled
+from preprocessing.schemas import SCHEMA_BO, compacter
+
+
+CHUNK_ROWS = 50_000
+
+# Colonnes dates du BO (typées "date" dans le schéma)
+DATE_COLS = [c for c in REQUIRED_COLS if SCHEMA_BO.get(c) == "date"]
+
+# Exports CSV "français" : jour en premier ; formats essayés dans l'ordre,
+# analyse mixte (jour en premier) en dernier recours
+FORMATS_DATE_CSV = [
+    "%d/%m/%Y",
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M",
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+]
+
+# Encodages des exports CSV : UTF-8 (avec ou sans BOM), sinon Windows
+ENCODAGES_CSV = ["utf-8-sig", "cp1252"]
+ECHANTILLON_ENCODAGE = 1 << 20
+
+
+def _verifier_entete(header: list[str]):
+    missing = [c for c in REQUIRED_COLS if c not in header]
+    if missing:
+        raise ValueError(f"Colonnes manquantes dans BO : {missing}")
+
+
+def _iter_xlsx(data: bytes, chunk_rows: int):
+    # read_only : les lignes sont lues à la demande, jamais le classeur entier
+    wb = load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    try:
+        # Première feuille (comme pd.read_excel), dimensions recalculées :
+        # une balise <dimension> erronée tronquerait la lecture
+        ws = wb.worksheets[0]
+        ws.reset_dimensions()
+        rows = ws.iter_rows(values_only=True)
+        header = [str(c).strip() if c is not None else "" for c in next(rows, ())]
+        _verifier_entete(header)
+
+        # Projection : seules les colonnes nécessaires sont matérialisées
+        positions = [header.index(c) for c in REQUIRED_COLS]
+
+        while True:
+            bloc = list(islice(rows, chunk_rows))
+            if not bloc:
+                break
+            yield pd.DataFrame(
+                [[r[i] if i < len(r) else None for i in positions] for r in bloc],
+                columns=REQUIRED_COLS
+            )
+    finally:
+        wb.close()
+
+
+def _encodage_csv(data: bytes) -> str:
+    # Échantillon coupé en fin de ligne (pas de caractère multi-octets tronqué)
+    echantillon = data[:ECHANTILLON_ENCODAGE]
+    if len(data) > ECHANTILLON_ENCODAGE:
+        echantillon = echantillon[:echantillon.rfind(b"\n") + 1] or echantillon
+
+    for encodage in ENCODAGES_CSV[:-1]:
+        try:
+            echantillon.decode(encodage)
+            return encodage
+        except UnicodeDecodeError:
+            continue
+    return ENCODAGES_CSV[-1]
+
+
+def _dates_csv(s: pd.Series) -> pd.Series:
+    """
+    Dates texte d'un export CSV, jour en premier (31/01/2025)
+    - Format explicite si toutes les valeurs renseignées le respectent
+    """
+    s = s.str.strip()
+    renseignees = s.notna() & s.ne("")
+    for fmt in FORMATS_DATE_CSV:
+        dates = pd.to_datetime(s, format=fmt, errors="coerce")
+        if dates.notna().sum() == renseignees.sum():
+            return dates
+    return pd.to_datetime(s, format="mixed", dayfirst=True, errors="coerce")
+
+
+def _iter_csv(data: bytes, chunk_rows: int):
+    # Séparateur déduit de l'en-tête (exports BO : ";" le plus souvent)
+    entete = data.split(b"\n", 1)[0]
+    sep = max([b";", b",", b"\t"], key=entete.count).decode()
+    encodage = _encodage_csv(data)
+
+    # En-tête vérifié avant de lire la moindre ligne
+    header = pd.read_csv(io.BytesIO(data), sep=sep, encoding=encodage, nrows=0).columns
+    _verifier_entete([c.strip() for c in header])
+
+    chunks = pd.read_csv(
+        io.BytesIO(data),
+        sep=sep,
+        encoding=encodage,
+        usecols=lambda c: c.strip() in REQUIRED_COLS,
+        # Dates lues en texte : l'interprétation (jour en premier) est explicite
+        dtype={c: str for c in header if c.strip() in DATE_COLS},
+        chunksize=chunk_rows,
+    )
+    for chunk in chunks:
+        chunk = chunk.rename(columns=str.strip)
+        yield chunk.assign(**{c: _dates_csv(chunk[c]) for c in DATE_COLS})
+
+
+def iter_bo_chunks(data: bytes, chunk_rows: int = CHUNK_ROWS):
+    """
+    Blocs de lignes du BO (xlsx ou export CSV), projetés sur REQUIRED_COLS
+    """
+    # Un .xlsx est une archive zip
+    if data[:2] == b"PK":
+        return _iter_xlsx(data, chunk_rows)
+    return _iter_csv(data, chunk_rows)
+
+
+@profiled("ingest.bo_flux")
+def read_bo_filtered(data: bytes, debut: pd.Timestamp | None,
+                     chunk_rows: int = CHUNK_ROWS) -> pd.DataFrame:
+    """
+    Lecture en flux du BO avec filtres appliqués bloc par bloc
+    (constructeur, dates renseignées, période) : la mémoire dépend
+    du résultat filtré, pas de la taille de l'export
+    - Annulation (job remplacé) vérifiée à chaque bloc
+    """
+    blocs = []
+    for chunk in iter_bo_chunks(data, chunk_rows):
+        verifier_annulation()
+        blocs.append(filtrer_bo(chunk.rename(columns=str.strip), debut))
+
+    if not blocs:
+        return pd.DataFrame(columns=REQUIRED_COLS)
+
+    return compacter(pd.concat(blocs, ignore_index=True), SCHEMA_BO)
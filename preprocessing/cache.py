@@ -0,0 +1,115 @@
+# preprocessing/cache.py
+
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def taille_objet(obj) -> int:
+    """
+    Estimation de l'empreinte mémoire (octets) d'un objet mis en cache
+    """
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(obj, pd.DataFrame) else int(usage)
+    if hasattr(obj, "nbytes"):
+        return int(obj.nbytes)
+    return sys.getsizeof(obj)
+
+
+class LRUCache:
+    """
+    Cache borné (nombre d'entrées + mémoire) avec éviction LRU
+    - Thread-safe (Streamlit peut servir plusieurs sessions en parallèle)
+    - Compteurs hits / misses / évictions
+    """
+
+    def __init__(self, max_entries: int = 8, max_bytes: int | None = None,
+                 sizeof=taille_objet):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        size = self._sizeof(value)
+
+        with self._lock:
+            if key in self._data:
+                self._bytes -= self._sizes.pop(key)
+                del self._data[key]
+
+            # Objet plus gros que le budget total : non mis en cache
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+
+            self._data[key] = value
+            self._sizes[key] = size
+            self._bytes += size
+            self._evict()
+
+    def get_or_compute(self, key, compute):
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def discard(self, predicate) -> int:
+        """
+        Supprime les entrées dont la clé vérifie `predicate`
+        """
+        with self._lock:
+            keys = [k for k in self._data if predicate(k)]
+            for k in keys:
+                del self._data[k]
+                self._bytes -= self._sizes.pop(k)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _evict(self):
+        while self._data and (
+            len(self._data) > self.max_entries
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            key, _ = self._data.popitem(last=False)
+            self._bytes -= self._sizes.pop(key)
+            self.evictions += 1
@@ -0,0 +1,93 @@
+# preprocessing/calendrier.py
+
+import json
+import os
+from datetime import date, timedelta
+from functools import lru_cache
+
+import numpy as np
+
+from preprocessing.storage import DATA_DIR
+
+
+# ==================================================
+# CALENDRIER DES JOURS OUVRÉS – SÉNÉGAL
+# ==================================================
+# Semaine ouvrée du lundi au vendredi
+WEEKMASK = "1111100"
+
+# Fêtes à date fixe
+FERIES_FIXES = {
+    (1, 1): "Jour de l'an",
+    (4, 4): "Fête de l'Indépendance",
+    (5, 1): "Fête du Travail",
+    (8, 15): "Assomption",
+    (11, 1): "Toussaint",
+    (12, 25): "Noël",
+}
+
+# Fêtes musulmanes (Korité, Tabaski, Tamkharit, Magal, Maouloud) : dates
+# lunaires fixées chaque année par décret, à renseigner dans ce fichier
+# (liste JSON de dates "AAAA-MM-JJ") ou via COPILOT_FERIES
+FERIES_VARIABLES_PATH = DATA_DIR / "calendrier" / "feries_senegal.json"
+
+ANNEES = range(2015, 2041)
+
+
+def _paques(annee: int) -> date:
+    # Algorithme de Meeus / Jones / Butcher (calendrier grégorien)
+    a, b, c = annee % 19, annee // 100, annee % 100
+    d, e = divmod(b, 4)
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    mois, jour = divmod(h + l - 7 * m + 114, 31)
+    return date(annee, mois, jour + 1)
+
+
+def feries_calcules(annee: int) -> list[date]:
+    """
+    Fêtes fixes + lundi de Pâques, Ascension, lundi de Pentecôte
+    """
+    paques = _paques(annee)
+    return [date(annee, m, j) for m, j in FERIES_FIXES] + [
+        paques + timedelta(days=1),
+        paques + timedelta(days=39),
+        paques + timedelta(days=50),
+    ]
+
+
+def feries_variables() -> list[date]:
+    path = os.environ.get("COPILOT_FERIES") or FERIES_VARIABLES_PATH
+    try:
+        with open(path, encoding="utf-8") as f:
+            return [date.fromisoformat(d) for d in json.load(f)]
+    except FileNotFoundError:
+        return []
+
+
+@lru_cache(maxsize=1)
+def calendrier_senegal() -> np.busdaycalendar:
+    """
+    Calendrier numpy (semaine ouvrée + jours fériés), construit une fois
+    """
+    feries = [d for annee in ANNEES for d in feries_calcules(annee)]
+    feries += feries_variables()
+    return np.busdaycalendar(
+        weekmask=WEEKMASK,
+        holidays=np.array(sorted(set(feries)), dtype="datetime64[D]")
+    )
+
+
+def jours_ouvres(debut, fin) -> np.ndarray:
+    """
+    Jours ouvrés dans [debut, fin) pour des tableaux datetime64 (vectorisé)
+    - Même convention que (fin - debut).days ; négatif si fin < debut
+    """
+    return np.busday_count(
+        np.asarray(debut, dtype="datetime64[D]"),
+        np.asarray(fin, dtype="datetime64[D]"),
+        busdaycal=calendrier_senegal()
+    )
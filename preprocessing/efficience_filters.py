@@ -0,0 +1,120 @@
+# preprocessing/efficience_filters.py
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from preprocessing.cache import LRUCache
+from preprocessing.profiling import profiled
+
+
+# Dimensions filtrables de la page Efficience
+DIMENSIONS = ["Equipe", "Position", "Type OR"]
+
+
+@dataclass(frozen=True)
+class FiltreIndex:
+    """
+    Index de filtrage construit une fois par fichier
+    - Dimensions converties en catégories
+    - Un bitmap (np.packbits) par valeur de dimension
+    - Bitmaps des masques fixes : "exploitable" (Efficience_OR connue),
+      "encours" (Position == "EC")
+    - ordre : lignes triées une fois par Efficience_OR croissante (NaN en fin)
+    """
+
+    df: pd.DataFrame
+    valeurs: dict
+    bitmaps: dict
+    masques: dict
+    ordre: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def bitmap(self, selections: dict, *masques: str) -> np.ndarray:
+        """
+        Intersection des dimensions (union des valeurs dans une dimension)
+        - Sélection vide : dimension non filtrée
+        """
+        n_bytes = (len(self.df) + 7) // 8
+        bits = np.full(n_bytes, 0xFF, dtype=np.uint8)
+
+        for dim, sel in selections.items():
+            if not sel:
+                continue
+            union = np.zeros(n_bytes, dtype=np.uint8)
+            for valeur in sel:
+                if valeur in self.bitmaps[dim]:
+                    union |= self.bitmaps[dim][valeur]
+            bits &= union
+
+        for nom in masques:
+            bits &= self.masques[nom]
+
+        return bits
+
+    def lignes(self, selections: dict, *masques: str) -> np.ndarray:
+        bits = self.bitmap(selections, *masques)
+        return np.flatnonzero(np.unpackbits(bits, count=len(self.df)))
+
+    def compte(self, selections: dict, *masques: str) -> int:
+        bits = self.bitmap(selections, *masques)
+        return int(np.count_nonzero(np.unpackbits(bits, count=len(self.df))))
+
+    def filtrer(self, selections: dict, *masques: str) -> pd.DataFrame:
+        return self.df.take(self.lignes(selections, *masques))
+
+    def classement(self, selections: dict, *masques: str) -> np.ndarray:
+        """
+        Lignes de la sélection par Efficience_OR croissante, sans tri :
+        parcours de l'ordre global filtré par le bitmap
+        """
+        bits = np.unpackbits(self.bitmap(selections, *masques), count=len(self.df))
+        return self.ordre[bits[self.ordre].astype(bool)]
+
+
+def _pack(mask) -> np.ndarray:
+    return np.packbits(np.asarray(mask, dtype=bool))
+
+
+@profiled("aggregate.filtre_index")
+def build_filtre_index(df: pd.DataFrame) -> FiltreIndex:
+    df = df.astype({dim: "category" for dim in DIMENSIONS})
+
+    valeurs, bitmaps = {}, {}
+    for dim in DIMENSIONS:
+        col = df[dim].cat.remove_unused_categories()
+        codes = col.cat.codes.to_numpy()
+        categories = np.asarray(col.cat.categories)
+
+        ordre = np.argsort(categories.astype(str))
+        valeurs[dim] = list(categories[ordre])
+        bitmaps[dim] = {
+            categories[i]: _pack(codes == i) for i in range(len(categories))
+        }
+
+    masques = {
+        "exploitable": _pack(df["Efficience_OR"].notna()),
+        "encours": _pack(df["Position"] == "EC"),
+    }
+
+    ordre = np.argsort(
+        df["Efficience_OR"].to_numpy(dtype="float64", na_value=np.nan),
+        kind="stable"
+    )
+
+    return FiltreIndex(
+        df=df, valeurs=valeurs, bitmaps=bitmaps, masques=masques, ordre=ordre
+    )
+
+
+_index = LRUCache(max_entries=4)
+
+
+def filtre_index_for(key, df: pd.DataFrame) -> FiltreIndex:
+    """
+    Index construit une seule fois par jeu de données (clé = hash du fichier)
+    """
+    return _index.get_or_compute(key, lambda: build_filtre_index(df))
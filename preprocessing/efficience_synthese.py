@@ -0,0 +1,80 @@
+# preprocessing/efficience_synthese.py
+
+import numpy as np
+import pandas as pd
+
+from preprocessing.profiling import profiled
+from preprocessing.segments import codes_groupes, quantile_segments, segments
+
+
+# ==================================================
+# SYNTHÈSE EFFICIENCE (équipe / technicien / type OR)
+# ==================================================
+AXES = {
+    "equipe": "Equipe",
+    "technicien": "Technicien",
+    "type_or": "Type OR",
+}
+
+QUANTILES = {"Efficience P10": 0.1, "Efficience médiane": 0.5, "Efficience P90": 0.9}
+
+
+def agreger_efficience(df: pd.DataFrame, axe: str) -> pd.DataFrame:
+    """
+    Par groupe : OR, temps cumulés, efficience pondérée par le temps
+    (Σ Temps_reference / Σ Temps_consomé_BO) et quantiles d'Efficience_OR
+    - Sommes : np.bincount sur les codes de groupe
+    - Quantiles : tri (groupe, efficience) puis lecture par segment
+    """
+    col = AXES[axe]
+    codes, labels = codes_groupes(df[col])
+    n = len(labels)
+
+    ref = df["Temps_reference"].to_numpy(dtype="float64", na_value=np.nan)
+    bo = df["Temps_consomé_BO"].to_numpy(dtype="float64", na_value=np.nan)
+    eff = df["Efficience_OR"].to_numpy(dtype="float64", na_value=np.nan)
+
+    valides = codes >= 0
+    # Pondération : OR dont les deux temps sont connus et le temps BO non nul
+    pondere = valides & ~np.isnan(ref) & (bo > 0)
+
+    nb_or = np.bincount(codes[valides], minlength=n)
+    temps_ref = np.bincount(codes[pondere], weights=ref[pondere], minlength=n)
+    temps_bo = np.bincount(codes[pondere], weights=bo[pondere], minlength=n)
+
+    out = {
+        col: labels,
+        "OR": nb_or,
+        "Temps référence": temps_ref,
+        "Temps consommé": temps_bo,
+        "Efficience pondérée": np.divide(
+            temps_ref, temps_bo,
+            out=np.full(n, np.nan),
+            where=temps_bo > 0
+        ),
+    }
+
+    exploitables = valides & ~np.isnan(eff)
+    c, e = codes[exploitables], eff[exploitables]
+    ordre = np.lexsort((e, c))
+    c, e = c[ordre], e[ordre]
+    debuts, comptes = segments(c)
+
+    for nom, q in QUANTILES.items():
+        out[nom] = np.full(n, np.nan)
+        if len(c):
+            out[nom][c[debuts]] = quantile_segments(e, debuts, comptes, q)
+
+    return (
+        pd.DataFrame(out)[nb_or > 0]
+        .sort_values("Efficience pondérée", na_position="last")
+        .reset_index(drop=True)
+    )
+
+
+@profiled("aggregate.efficience_synthese")
+def build_synthese(df: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """
+    Tables de synthèse des trois axes (une fois par ingestion)
+    """
+    return {axe: agreger_efficience(df, axe) for axe in AXES}
@@ -1,56 +1,146 @@
 # preprocessing/exhaustivite_preprocessing.py
 
-def compute_exhaustivite(df: pd.DataFrame) -> dict:
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from preprocessing.profiling import profiled
+
+
+STATUTS = np.array(
+    [
+        "Weekend OK",
+        "Travail weekend",
+        "Non conforme",
+        "Incomplet",
+        "Conforme",
+        "Surpointage",
+    ],
+    dtype=object
+)
+
+# Cellule sans pointage (libellé "")
+STATUT_ABSENT = -1
+LIBELLES = np.append(STATUTS, "")
+
+
+def statut_pointage(hr_totale, hr_theorique, weekday):
+    """
+    Règle de référence (scalaire) – un technicien / un jour
+    """
+    # Weekend
+    if weekday >= 5:
+        return "Weekend OK" if hr_totale == 0 else "Travail weekend"
+
+    # Jour ouvré
+    if hr_theorique > 0 and hr_totale == 0:
+        return "Non conforme"
+    if hr_totale < hr_theorique:
+        return "Incomplet"
+    if hr_totale == hr_theorique:
+        return "Conforme"
+    return "Surpointage"
+
+
+def classer_statuts(hr_totale, hr_theorique, weekday) -> np.ndarray:
+    """
+    Version vectorisée de `statut_pointage`
+    - Retourne les codes int8 indexant STATUTS
+    - Conditions évaluées dans le même ordre que la règle scalaire
+    """
+    hr_totale = np.asarray(hr_totale, dtype="float64")
+    hr_theorique = np.asarray(hr_theorique, dtype="float64")
+    weekday = np.asarray(weekday, dtype="float64")
+
+    weekend = weekday >= 5
+
+    conditions = [
+        weekend & (hr_totale == 0),
+        weekend,
+        (hr_theorique > 0) & (hr_totale == 0),
+        hr_totale < hr_theorique,
+        hr_totale == hr_theorique,
+    ]
+
+    return np.select(conditions, [0, 1, 2, 3, 4], default=5).astype(np.int8)
+
+
+@dataclass(frozen=True)
+class ExhaustiviteMois:
+    """
+    Grille d'exhaustivité d'un mois (1 ligne = 1 technicien, 1 colonne = 1 jour)
+    - codes : int8, index dans STATUTS (STATUT_ABSENT = pas de pointage)
+    - heures : float32, Hr_Totale (0 = pas de pointage)
+    """
+
+    mois: str
+    techniciens: np.ndarray
+    jours: np.ndarray
+    equipes: np.ndarray
+    codes: np.ndarray
+    heures: np.ndarray
+
+    def cellules(self) -> pd.DataFrame:
+        """
+        Format long (1 ligne = 1 technicien / 1 jour pointé) pour export
+        """
+        n_tech, n_jours = self.codes.shape
+        presents = self.codes.ravel() != STATUT_ABSENT
+
+        return pd.DataFrame({
+            "Mois": self.mois,
+            "Technicien": np.repeat(self.techniciens, n_jours)[presents],
+            "Equipe": np.repeat(self.equipes, n_jours)[presents],
+            "Jour": np.tile(self.jours, n_tech)[presents],
+            "Statut": LIBELLES[self.codes.ravel()[presents]],
+            "Heures": self.heures.ravel()[presents],
+        })
+
+
+@profiled("aggregate.exhaustivite")
+def compute_exhaustivite(df: pd.DataFrame) -> dict[str, ExhaustiviteMois]:
     """
     Exhaustivité basée sur Hr_Théorique (BI-approved)
+    - Une grille compacte (int8 / float32) par mois, sans pivot ni dict imbriqué
     """
 
-    def statut_pointage(hr_totale, hr_theorique, weekday):
-        # Weekend
-        if weekday >= 5:
-            return "Weekend OK" if hr_totale == 0 else "Travail weekend"
-
-        # Jour ouvré
-        if hr_theorique > 0 and hr_totale == 0:
-            return "Non conforme"
-        if hr_totale < hr_theorique:
-            return "Incomplet"
-        if hr_totale == hr_theorique:
-            return "Conforme"
-        return "Surpointage"
-
-    df = df.copy()
-
-    df["Statut"] = df.apply(
-        lambda r: statut_pointage(
-            r["Hr_Totale"],
-            r["Hr_Théorique"],
-            r["Jour_semaine"]
-        ),
-        axis=1
+    codes = classer_statuts(
+        df["Hr_Totale"],
+        df["Hr_Théorique"],
+        df["Jour_semaine"]
     )
+    heures = df["Hr_Totale"].to_numpy(dtype="float32", na_value=0)
+    jours = df["Jour"].to_numpy()
+    equipes = df["Equipe3"].to_numpy()
+
+    tech_codes, techniciens = pd.factorize(df["Salarié - Nom"], sort=True)
+    techniciens = np.asarray(techniciens, dtype=object)
 
     result = {}
 
-    for mois, df_m in df.groupby("Mois"):
-        result[mois] = {
-            "statuts": df_m.pivot(
-                index="Salarié - Nom",
-                columns="Jour",
-                values="Statut"
-            ).fillna("").to_dict(orient="index"),
-
-            "heures": df_m.pivot(
-                index="Salarié - Nom",
-                columns="Jour",
-                values="Hr_Totale"
-            ).fillna(0).to_dict(orient="index"),
-
-            "teams": (
-                df_m.groupby("Salarié - Nom")["Equipe3"]
-                .first()
-                .to_dict()
-            )
-        }
+    for mois, idx in df.groupby("Mois", sort=True, observed=True).indices.items():
+        # Index locaux technicien / jour du mois
+        techs_m, premiere, t_local = np.unique(
+            tech_codes[idx], return_index=True, return_inverse=True
+        )
+        jours_m, j_local = np.unique(jours[idx], return_inverse=True)
+
+        shape = (len(techs_m), len(jours_m))
+
+        codes_m = np.full(shape, STATUT_ABSENT, dtype=np.int8)
+        codes_m[t_local, j_local] = codes[idx]
+
+        heures_m = np.zeros(shape, dtype=np.float32)
+        heures_m[t_local, j_local] = heures[idx]
+
+        result[mois] = ExhaustiviteMois(
+            mois=mois,
+            techniciens=techniciens[techs_m],
+            jours=jours_m,
+            equipes=equipes[idx[premiere]],
+            codes=codes_m,
+            heures=heures_m,
+        )
 
     return result
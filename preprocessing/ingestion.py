@@ -0,0 +1,94 @@
+# preprocessing/ingestion.py
+
+import hashlib
+import os
+
+import pandas as pd
+
+from preprocessing.cache import LRUCache
+from preprocessing.snapshot_store import load_or_ingest
+
+
+# ==================================================
+# CACHE PROCESSUS (partagé entre sessions et reruns)
+# ==================================================
+MAX_ENTRIES = int(os.environ.get("COPILOT_CACHE_MAX_ENTRIES", 8))
+MAX_BYTES = int(os.environ.get("COPILOT_CACHE_MAX_MB", 1024)) * 1024 * 1024
+
+_cache = LRUCache(max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES)
+
+
+def read_bytes(source) -> bytes:
+    """
+    Contenu brut d'un fichier uploadé (Streamlit), d'un chemin ou de bytes
+    """
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return f.read()
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+
+    pos = source.tell()
+    source.seek(0)
+    data = source.read()
+    source.seek(pos)
+    return data
+
+
+def file_digest(source) -> str:
+    """
+    Empreinte du contenu (indépendante du nom du fichier)
+    """
+    return hashlib.blake2b(read_bytes(source), digest_size=16).hexdigest()
+
+
+def files_digest(sources) -> str:
+    """
+    Empreinte d'un lot de fichiers (indépendante de l'ordre d'upload)
+    """
+    digests = sorted(file_digest(s) for s in sources)
+    return hashlib.blake2b("".join(digests).encode(), digest_size=16).hexdigest()
+
+
+def load_extract(source, kind: str) -> pd.DataFrame:
+    """
+    Extraction typée ("pointage", "bo", "efficience")
+    - Cache mémoire (processus) -> snapshot Parquet (disque) -> Excel
+    - Le DataFrame retourné est partagé : ne pas le modifier en place
+    """
+    return load_cached(
+        source,
+        kind,
+        lambda data, digest: load_or_ingest(data, digest, kind)
+    )
+
+
+def load_cached(source, key, parse) -> pd.DataFrame:
+    """
+    Résultat de `parse(data, digest)` mis en cache par (hash du contenu, clé)
+    - Pour les lectures spécialisées (ex. flux BO filtré)
+    """
+    data = read_bytes(source)
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    return cached((digest, key), lambda: parse(data, digest))
+
+
+def cached(key, compute):
+    """
+    Accès direct au cache d'ingestion (clé libre, ex. lot de fichiers)
+    """
+    return _cache.get_or_compute(key, compute)
+
+
+def ingestion_stats() -> dict:
+    """
+    Compteurs du cache d'ingestion (hits, misses, évictions, mémoire)
+    """
+    return _cache.stats()
+
+
+def clear_ingestion_cache():
+    _cache.clear()
@@ -0,0 +1,234 @@
+# preprocessing/kpi_engine.py
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from preprocessing.bo_stream import read_bo_filtered
+from preprocessing.efficience_filters import FiltreIndex, build_filtre_index
+from preprocessing.efficience_synthese import build_synthese
+from preprocessing.exhaustivite_preprocessing import compute_exhaustivite
+from preprocessing.ingestion import file_digest, load_extract, read_bytes
+from preprocessing.kpi_store import enregistrer_kpi
+from preprocessing.llti_groupes import AXES, agreger_llti
+from preprocessing.llti_preprocess import debut_trimestre, finaliser_llti
+from preprocessing.llti_stats import LLTIStats
+from preprocessing.preprocess_productivite import preprocess_productivite
+from preprocessing.productivite_cube import ProductiviteCube, build_cube
+from preprocessing.profiling import profiled
+
+
+# ==================================================
+# MOTEUR KPI (sans Streamlit)
+# ==================================================
+# Utilisé par les pages Streamlit et par le batch (batch_kpis.py)
+
+COLONNES_ENCOURS = [
+    "OR",
+    "Nom Client OR (or)",
+    "Equipe",
+    "Technicien",
+    "Temps_reference",
+    "Temps_consomé_BO",
+    "Efficience_OR",
+    "Planifié ?"
+]
+
+
+def ratio(num: float, den: float) -> float:
+    return num / den if den > 0 else 0
+
+
+# ==================================================
+# PRODUCTIVITÉ
+# ==================================================
+@profiled("aggregate.productivite")
+def kpis_productivite(cube: ProductiviteCube, mois, equipes) -> dict:
+    """
+    Productivité globale, par technicien et par jour pour une sélection
+    """
+    total_fact, total_trav = cube.totaux(mois, equipes)
+
+    return {
+        "productivite_globale": ratio(total_fact, total_trav),
+        "prod_tech": (
+            cube.rollup(mois, equipes, by="tech")
+            .sort_values("Productivité", ascending=False)
+        ),
+        "prod_jour": cube.rollup(mois, equipes, by="date"),
+    }
+
+
+def productivite_annee(cube: ProductiviteCube, annee: int | None = None) -> float | None:
+    """
+    Productivité cumulée (YTD) des mois de l'année présents dans le cube
+    """
+    annee = annee or pd.Timestamp.today().year
+    mois = [m for m in cube.labels["Mois"] if m.startswith(f"{annee}-")]
+    if not mois:
+        return None
+    return ratio(*cube.totaux(mois, cube.labels["Equipe3"]))
+
+
+# ==================================================
+# EFFICIENCE
+# ==================================================
+@profiled("aggregate.efficience")
+def kpis_efficience(index: FiltreIndex, selections: dict) -> dict:
+    """
+    Indicateurs globaux et encours actionnable pour une sélection de filtres
+    - encours_lignes : OR encours exploitables, efficience la plus faible
+      en premier (positions dans index.df, voir table_encours)
+    """
+    n_filtre = index.compte(selections)
+    df_eff = index.filtrer(selections, "exploitable")
+
+    # Pondérée par le temps : Σ Temps_reference / Σ Temps_consomé_BO
+    ref = df_eff["Temps_reference"].to_numpy(dtype="float64", na_value=np.nan)
+    bo = df_eff["Temps_consomé_BO"].to_numpy(dtype="float64", na_value=np.nan)
+    avec_temps = (bo > 0) & ~np.isnan(ref)
+    temps_ref, temps_bo = ref[avec_temps].sum(), bo[avec_temps].sum()
+
+    return {
+        "efficience_moyenne": df_eff["Efficience_OR"].mean(),
+        "efficience_ponderee": temps_ref / temps_bo if temps_bo > 0 else float("nan"),
+        "or_exploitables": len(df_eff),
+        "or_filtres": n_filtre,
+        "part_encours": ratio(index.compte(selections, "encours"), n_filtre),
+        "encours_lignes": index.classement(selections, "exploitable", "encours"),
+    }
+
+
+def table_encours(index: FiltreIndex, lignes) -> pd.DataFrame:
+    """
+    Colonnes d'affichage de l'encours pour les lignes demandées (une page)
+    """
+    return index.df.take(lignes)[COLONNES_ENCOURS]
+
+
+# ==================================================
+# LLTI
+# ==================================================
+@profiled("aggregate.llti")
+def kpis_llti(df_llti: pd.DataFrame, stats: LLTIStats | None = None) -> dict:
+    """
+    LLTI moyen / médian / P90 / P95, nombre de factures et distribution (jours)
+    - Histogramme journalier (LLTIStats) : un seul passage, sans tri
+    - `stats` déjà fusionnées (plusieurs fichiers / trimestres) acceptées
+    """
+    if stats is None:
+        stats = LLTIStats.depuis(df_llti["LLTI_jours"].to_numpy())
+
+    p50, p90, p95 = stats.quantiles([0.5, 0.9, 0.95])
+
+    return {
+        "llti_moyen": stats.moyenne(),
+        "llti_mediane": p50,
+        "llti_p90": p90,
+        "llti_p95": p95,
+        # Une ligne par facture après finaliser_llti
+        "nb_factures": stats.compte,
+        "distribution": stats.distribution(),
+        "stats": stats,
+    }
+
+
+# ==================================================
+# BATCH
+# ==================================================
+def _scalar(value):
+    return None if pd.isna(value) else float(value)
+
+
+def run_batch(out_dir, pointages=None, bo=None, efficience=None,
+              mode_llti: str = "calendaires") -> dict:
+    """
+    Calcule tous les KPI disponibles à partir des extractions fournies
+    - Tables détaillées en Parquet, valeurs clés dans kpis.json
+    - LLTI en jours calendaires ou ouvrés (mode_llti)
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    summary = {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "sources": {},
+        "kpis": {},
+    }
+
+    def export(name: str, df: pd.DataFrame):
+        df.to_parquet(out_dir / f"{name}.parquet", index=False)
+
+    if pointages is not None:
+        df_day = preprocess_productivite(load_extract(pointages, "pointage"))
+        cube = build_cube(df_day)
+        mois = cube.labels["Mois"]
+        equipes = cube.labels["Equipe3"]
+
+        kpis = kpis_productivite(cube, mois, equipes)
+        export("productivite_technicien", kpis["prod_tech"])
+        export("productivite_jour", kpis["prod_jour"])
+        export("productivite_mois", cube.rollup(mois, equipes, by="mois"))
+
+        exhaustivite = compute_exhaustivite(df_day)
+        export(
+            "exhaustivite",
+            pd.concat([m.cellules() for m in exhaustivite.values()], ignore_index=True)
+        )
+
+        summary["sources"]["pointages"] = file_digest(pointages)
+        summary["kpis"]["productivite_globale"] = _scalar(kpis["productivite_globale"])
+        summary["kpis"]["productivite_ytd"] = productivite_annee(cube)
+
+    if efficience is not None:
+        index = build_filtre_index(load_extract(efficience, "efficience"))
+        kpis = kpis_efficience(index, {})
+        export("efficience_encours", table_encours(index, kpis["encours_lignes"]))
+        for axe, table in build_synthese(index.df).items():
+            export(f"efficience_par_{axe}", table)
+
+        summary["sources"]["efficience"] = file_digest(efficience)
+        summary["kpis"].update({
+            "efficience_moyenne": _scalar(kpis["efficience_moyenne"]),
+            "efficience_ponderee": _scalar(kpis["efficience_ponderee"]),
+            "or_exploitables": kpis["or_exploitables"],
+            "part_encours": _scalar(kpis["part_encours"]),
+        })
+
+    if bo is not None:
+        # Lecture en flux (xlsx ou CSV) : seules les lignes du trimestre en
+        # cours sont gardées, la mémoire suit le résultat filtré
+        df_llti = finaliser_llti(
+            read_bo_filtered(read_bytes(bo), debut_trimestre()), mode_llti
+        )
+        kpis = kpis_llti(df_llti)
+        export("llti_detail", df_llti)
+        for axe in AXES:
+            export(f"llti_par_{axe}", agreger_llti(df_llti, axe))
+
+        summary["sources"]["bo"] = file_digest(bo)
+        summary["llti_unite"] = mode_llti
+        summary["kpis"].update({
+            "llti_moyen": _scalar(kpis["llti_moyen"]),
+            "llti_mediane": _scalar(kpis["llti_mediane"]),
+            "llti_p90": _scalar(kpis["llti_p90"]),
+            "llti_p95": _scalar(kpis["llti_p95"]),
+            "nb_factures": int(kpis["nb_factures"]),
+        })
+
+    # Valeurs clés reprises par la page Accueil (LLTI : avec son unité)
+    for nom in ["productivite_ytd", "efficience_moyenne"]:
+        enregistrer_kpi(nom, summary["kpis"].get(nom), source="batch")
+    enregistrer_kpi(
+        "llti_moyen", summary["kpis"].get("llti_moyen"),
+        unite=mode_llti, source="batch"
+    )
+
+    (out_dir / "kpis.json").write_text(
+        json.dumps(summary, indent=2, ensure_ascii=False),
+        encoding="utf-8"
+    )
+    return summary
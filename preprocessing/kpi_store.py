@@ -0,0 +1,54 @@
+# preprocessing/kpi_store.py
+
+import json
+import math
+import threading
+from datetime import datetime
+
+from preprocessing.storage import DATA_DIR, atomic_write
+
+
+# ==================================================
+# RÉSUMÉ PERSISTANT DES KPI (page Accueil)
+# ==================================================
+# Volontairement léger (json / pathlib) : lu à chaque affichage de l'accueil
+STORE_PATH = DATA_DIR / "kpi_summary.json"
+
+_lock = threading.Lock()
+
+
+def lire_kpis() -> dict:
+    """
+    Dernières valeurs calculées : {nom: {"valeur", "maj", ...}}
+    """
+    try:
+        return json.loads(STORE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def enregistrer_kpi(nom: str, valeur, **details) -> bool:
+    """
+    Enregistre la valeur d'un KPI avec son horodatage
+    - Pas d'écriture si la valeur et les détails sont inchangés
+    """
+    if valeur is None or math.isnan(valeur):
+        return False
+    valeur = float(valeur)
+
+    with _lock:
+        kpis = lire_kpis()
+        actuel = kpis.get(nom, {})
+        if actuel.get("valeur") == valeur and all(
+            actuel.get(k) == v for k, v in details.items()
+        ):
+            return False
+
+        kpis[nom] = {
+            "valeur": valeur,
+            "maj": datetime.now().isoformat(timespec="seconds"),
+            **details,
+        }
+        contenu = json.dumps(kpis, indent=2, ensure_ascii=False)
+        atomic_write(STORE_PATH, lambda tmp: tmp.write_text(contenu, encoding="utf-8"))
+        return True
@@ -0,0 +1,62 @@
+# preprocessing/llti_groupes.py
+
+import numpy as np
+import pandas as pd
+
+from preprocessing.profiling import profiled
+from preprocessing.segments import codes_groupes, quantile_segments, segments
+
+
+# ==================================================
+# VENTILATION DU LLTI (client / équipement / OR)
+# ==================================================
+AXES = {
+    "client": "Nom Client OR (or)",
+    "equipement": "Numéro série Equipement (Segment)",
+    "or": "N° OR (Segment)",
+}
+
+QUANTILES = {"LLTI médian": 0.5, "LLTI P90": 0.9}
+
+
+@profiled("aggregate.llti_groupes")
+def agreger_llti(df_llti: pd.DataFrame, axe: str) -> pd.DataFrame:
+    """
+    Factures, LLTI moyen, quantiles et max par groupe, en un seul passage
+    - Tri (groupe, LLTI) puis réductions par segment (np.add.reduceat)
+    - Quantiles lus directement dans chaque segment trié (interpolation
+      linéaire, comme pandas)
+    """
+    col = AXES[axe]
+    colonnes = [col, "Factures", "LLTI moyen", *QUANTILES, "LLTI max"]
+
+    codes, labels = codes_groupes(df_llti[col])
+    llti = df_llti["LLTI_jours"].to_numpy(dtype="float64")
+
+    valides = (codes >= 0) & ~np.isnan(llti)
+    codes, llti = codes[valides], llti[valides]
+    if len(codes) == 0:
+        return pd.DataFrame(columns=colonnes)
+
+    ordre = np.lexsort((llti, codes))
+    codes, llti = codes[ordre], llti[ordre]
+
+    # Segments contigus d'un même groupe
+    debuts, comptes = segments(codes)
+
+    out = {
+        col: labels[codes[debuts]],
+        "Factures": comptes,
+        "LLTI moyen": np.add.reduceat(llti, debuts) / comptes,
+    }
+
+    for nom, q in QUANTILES.items():
+        out[nom] = quantile_segments(llti, debuts, comptes, q)
+
+    out["LLTI max"] = llti[debuts + comptes - 1]
+
+    return (
+        pd.DataFrame(out, columns=colonnes)
+        .sort_values(["LLTI moyen", "Factures"], ascending=False)
+        .reset_index(drop=True)
+    )
@@ -0,0 +1,147 @@
+# preprocessing/llti_index.py
+
+import threading
+
+import pandas as pd
+
+from preprocessing.llti_preprocess import calculer_llti, dedupliquer_factures
+from preprocessing.storage import DATA_DIR, atomic_write
+from preprocessing.profiling import profiled
+from preprocessing.schemas import SCHEMA_BO, compacter
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow optionnel
+    pq = None
+
+
+# ==================================================
+# INDEX PERSISTANT DES FACTURES (1 ligne = 1 facture)
+# ==================================================
+INDEX_PATH = DATA_DIR / "llti" / "factures.parquet"
+
+CLE = "N° Facture (Lignes)"
+
+# Lecture-fusion-écriture de l'index sérialisée (sessions concurrentes)
+_verrou = threading.Lock()
+
+# Colonnes dont un changement impose de recalculer la facture
+COLONNES_EMPREINTE = [
+    "N° OR (Segment)",
+    "Date Facture (Lignes)",
+    "Pointage dernière date (Segment)",
+    "Nom Client OR (or)",
+    "Numéro série Equipement (Segment)",
+]
+
+
+def index_available() -> bool:
+    return pq is not None
+
+
+def load_index() -> pd.DataFrame:
+    if not INDEX_PATH.exists():
+        return pd.DataFrame()
+    return pq.read_table(INDEX_PATH, memory_map=True).to_pandas()
+
+
+def _empreinte(df: pd.DataFrame) -> pd.Series:
+    return pd.util.hash_pandas_object(
+        df[COLONNES_EMPREINTE].astype(str), index=False
+    )
+
+
+@profiled("aggregate.llti_index")
+def update_index(df_filtre: pd.DataFrame) -> dict:
+    """
+    Intègre une extraction BO filtrée (sortie de filtrer_bo)
+    - Seules les factures nouvelles ou modifiées sont recalculées
+    - En cas de conflit, la dernière extraction l'emporte
+    """
+    with _verrou:
+        return _fusionner_index(df_filtre)
+
+
+def _fusionner_index(df_filtre: pd.DataFrame) -> dict:
+    candidats = dedupliquer_factures(df_filtre)
+    candidats = candidats.assign(**{CLE: candidats[CLE].astype(str)})
+    candidats["Empreinte"] = _empreinte(candidats).to_numpy()
+    candidats = candidats.set_index(CLE)
+
+    existant = load_index()
+    existant = existant.set_index(CLE) if not existant.empty else candidats.iloc[:0]
+
+    communes = candidats.index.intersection(existant.index)
+    modifiees = communes[
+        candidats.loc[communes, "Empreinte"].to_numpy()
+        != existant.loc[communes, "Empreinte"].to_numpy()
+    ]
+    nouvelles = candidats.index.difference(existant.index)
+
+    if len(nouvelles) == 0 and len(modifiees) == 0:
+        return {"nouvelles": 0, "modifiees": 0, "total": len(existant)}
+
+    a_traiter = calculer_llti(candidats.loc[nouvelles.union(modifiees)])
+
+    index = pd.concat([existant.drop(index=modifiees), a_traiter])
+    index = index.sort_values("Date Facture (Lignes)").reset_index()
+    index = compacter(index, SCHEMA_BO)
+
+    atomic_write(INDEX_PATH, lambda tmp: index.to_parquet(tmp, index=False))
+
+    return {
+        "nouvelles": len(nouvelles),
+        "modifiees": len(modifiees),
+        "total": len(index),
+    }
+
+
+def query_llti(debut=None, fin=None, fenetre_jours: int | None = None,
+               index: pd.DataFrame | None = None,
+               mode: str = "calendaires") -> pd.DataFrame:
+    """
+    Factures de l'index sur une période [debut, fin] ou une fenêtre glissante
+    (fenetre_jours jusqu'à aujourd'hui), LLTI >= 0 uniquement
+    - Index stocké en jours calendaires : LLTI recalculé sur la sélection
+      pour les autres unités (mode "ouvres")
+    """
+    df = load_index() if index is None else index
+    if df.empty:
+        return df
+
+    dates = df["Date Facture (Lignes)"]
+
+    if fenetre_jours is not None:
+        debut = pd.Timestamp.today().normalize() - pd.Timedelta(days=fenetre_jours)
+
+    mask = pd.Series(True, index=df.index)
+    if debut is not None:
+        mask &= dates >= pd.Timestamp(debut)
+    if fin is not None:
+        mask &= dates <= pd.Timestamp(fin)
+
+    df = df[mask]
+    if mode != "calendaires":
+        df = calculer_llti(df, mode)
+
+    return df[df["LLTI_jours"] >= 0]
+
+
+def tendance_llti(freq: str = "Q", index: pd.DataFrame | None = None,
+                  mode: str = "calendaires") -> pd.DataFrame:
+    """
+    LLTI par période (trimestre "Q" ou mois "M") : factures, moyenne, médiane
+    (unité selon `mode`)
+    """
+    df = query_llti(index=index, mode=mode)
+    if df.empty:
+        return pd.DataFrame(columns=["Période", "Factures", "LLTI moyen", "LLTI médian"])
+
+    periode = df["Date Facture (Lignes)"].dt.to_period(freq).astype(str)
+
+    return (
+        df.groupby(periode)["LLTI_jours"]
+        .agg(Factures="count", **{"LLTI moyen": "mean", "LLTI médian": "median"})
+        .rename_axis("Période")
+        .reset_index()
+    )
@@ -1,91 +1,135 @@
 # preprocessing/llti_preprocess.py
 
+import numpy as np
 import pandas as pd
-from datetime import datetime
 
+from preprocessing.calendrier import jours_ouvres
+from preprocessing.profiling import profiled
 
-def preprocess_llti(df_bo: pd.DataFrame) -> pd.DataFrame:
+
+# ==================================================
+# COLONNES NÉCESSAIRES
+# ==================================================
+REQUIRED_COLS = [
+    "N° OR (Segment)",
+    "N° Facture (Lignes)",
+    "Date Facture (Lignes)",
+    "Pointage dernière date (Segment)",
+    "Nom Client OR (or)",
+    "Numéro série Equipement (Segment)",
+    "Constructeur de l'équipement",
+]
+
+
+# Unité du LLTI : jours calendaires ou ouvrés (calendrier Sénégal)
+MODES_LLTI = {"calendaires": "Jours calendaires", "ouvres": "Jours ouvrés"}
+
+
+def debut_trimestre(today: pd.Timestamp | None = None) -> pd.Timestamp:
+    if today is None:
+        today = pd.Timestamp.today()
+    return today.normalize().to_period("Q").start_time
+
+
+def _est_caterpillar(s: pd.Series) -> pd.Series:
+    return s.astype(str).str.strip().str.upper().eq("CATERPILLAR")
+
+
+def filtrer_bo(df_bo: pd.DataFrame, debut: pd.Timestamp | None) -> pd.DataFrame:
     """
-    Prépare le dataset LLTI (Lead Time Facturation Service)
-    - Trimestre en cours
-    - Facture par facture
+    Filtres ligne à ligne du BO (applicables bloc par bloc)
+    - Projection sur les colonnes nécessaires
     - Matériels Caterpillar uniquement
     - Dossiers avec pointage
+    - Factures à partir de `debut` (None : toutes périodes)
     """
-
-    df = df_bo.copy()
-
-    # ==================================================
-    # COLONNES NÉCESSAIRES
-    # ==================================================
-    required_cols = [
-        "N° OR (Segment)",
-        "N° Facture (Lignes)",
-        "Date Facture (Lignes)",
-        "Pointage dernière date (Segment)",
-        "Nom Client OR (or)",
-        "Numéro série Equipement (Segment)",
-        "Constructeur de l'équipement",
-    ]
-
-    missing = [c for c in required_cols if c not in df.columns]
+    missing = [c for c in REQUIRED_COLS if c not in df_bo.columns]
     if missing:
         raise ValueError(f"Colonnes manquantes dans BO : {missing}")
 
-    df = df[required_cols]
+    df = df_bo[REQUIRED_COLS]
 
     # ==================================================
     # TYPAGE DATES
     # ==================================================
-    df["Date Facture (Lignes)"] = pd.to_datetime(
+    date_facture = pd.to_datetime(
         df["Date Facture (Lignes)"], errors="coerce"
     )
-    df["Pointage dernière date (Segment)"] = pd.to_datetime(
+    date_pointage = pd.to_datetime(
         df["Pointage dernière date (Segment)"], errors="coerce"
     )
 
     # ==================================================
-    # FILTRE : MATÉRIELS CATERPILLAR UNIQUEMENT
+    # FILTRES : CATERPILLAR / POINTAGE / PÉRIODE
     # ==================================================
-    df = df[
-        df["Constructeur de l'équipement"]
-        .astype(str)
-        .str.strip()
-        .str.upper()
-        .eq("CATERPILLAR")
-    ]
+    constructeur = df["Constructeur de l'équipement"]
+    if isinstance(constructeur.dtype, pd.CategoricalDtype):
+        # Test sur les catégories distinctes, puis report par code (-1 : vide)
+        cats = _est_caterpillar(constructeur.cat.categories.to_series())
+        caterpillar = pd.Series(
+            np.append(cats.to_numpy(), False)[constructeur.cat.codes.to_numpy()],
+            index=df.index
+        )
+    else:
+        caterpillar = _est_caterpillar(constructeur)
 
-    # ==================================================
-    # FILTRE : FACTURES AVEC POINTAGE
-    # ==================================================
-    df = df[
-        df["Pointage dernière date (Segment)"].notna()
-        & df["Date Facture (Lignes)"].notna()
-    ]
+    mask = (
+        caterpillar
+        & date_pointage.notna()
+        & date_facture.notna()
+    )
+    if debut is not None:
+        mask &= date_facture >= debut
 
-    # ==================================================
-    # FILTRE : TRIMESTRE EN COURS
-    # ==================================================
-    today = pd.Timestamp.today().normalize()
-    trimestre_debut = today.to_period("Q").start_time
+    return df[mask].assign(**{
+        "Date Facture (Lignes)": date_facture[mask],
+        "Pointage dernière date (Segment)": date_pointage[mask],
+    })
 
-    df = df[df["Date Facture (Lignes)"] >= trimestre_debut]
 
-    # ==================================================
-    # DÉDUPLICATION FACTURE PAR FACTURE
-    # ==================================================
-    df = (
+def dedupliquer_factures(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Une ligne par facture : dernier pointage connu
+    """
+    return (
         df.sort_values("Pointage dernière date (Segment)")
         .drop_duplicates(subset=["N° Facture (Lignes)"], keep="last")
     )
 
+
+def calculer_llti(df: pd.DataFrame, mode: str = "calendaires") -> pd.DataFrame:
+    """
+    LLTI = dernier pointage -> facture, en jours calendaires ou ouvrés
+    (np.busday_count vectorisé, week-ends et jours fériés exclus)
+    """
+    facture = df["Date Facture (Lignes)"]
+    pointage = df["Pointage dernière date (Segment)"]
+
+    if mode == "calendaires":
+        return df.assign(LLTI_jours=(facture - pointage).dt.days)
+    if mode != "ouvres":
+        raise ValueError(f"Mode LLTI inconnu : {mode}")
+
+    return df.assign(LLTI_jours=jours_ouvres(
+        pointage.to_numpy(), facture.to_numpy()
+    ))
+
+
+@profiled("preprocess.llti")
+def finaliser_llti(df: pd.DataFrame, mode: str = "calendaires") -> pd.DataFrame:
+    """
+    Déduplication facture par facture et calcul du LLTI (jours calendaires
+    ou ouvrés selon `mode`)
+    """
+    # ==================================================
+    # DÉDUPLICATION FACTURE PAR FACTURE
+    # ==================================================
+    df = dedupliquer_factures(df)
+
     # ==================================================
     # CALCUL LLTI (jours)
     # ==================================================
-    df["LLTI_jours"] = (
-        df["Date Facture (Lignes)"]
-        - df["Pointage dernière date (Segment)"]
-    ).dt.days
+    df = calculer_llti(df, mode)
 
     # ==================================================
     # NETTOYAGE FINAL
@@ -93,3 +137,14 @@ def preprocess_llti(df_bo: pd.DataFrame) -> pd.DataFrame:
     df = df[df["LLTI_jours"] >= 0]
 
     return df.reset_index(drop=True)
+
+
+def preprocess_llti(df_bo: pd.DataFrame, mode: str = "calendaires") -> pd.DataFrame:
+    """
+    Prépare le dataset LLTI (Lead Time Facturation Service)
+    - Trimestre en cours
+    - Facture par facture
+    - Matériels Caterpillar uniquement
+    - Dossiers avec pointage
+    """
+    return finaliser_llti(filtrer_bo(df_bo, debut_trimestre()), mode)
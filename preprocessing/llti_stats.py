@@ -0,0 +1,120 @@
+# preprocessing/llti_stats.py
+
+import numpy as np
+import pandas as pd
+
+
+# ==================================================
+# STATISTIQUES LLTI EN FLUX (fusionnables)
+# ==================================================
+# LLTI en jours entiers : un histogramme à pas de 1 jour donne des quantiles
+# exacts jusqu'à MAX_JOURS, au-delà les valeurs sont regroupées dans une
+# dernière classe (bornée par le maximum observé)
+MAX_JOURS = 3650
+
+
+class LLTIStats:
+    """
+    Compteur, somme, min / max et histogramme journalier des LLTI
+    - Alimenté bloc par bloc (ajouter), fusionnable entre fichiers,
+      extractions ou trimestres (fusionner, +)
+    - Mémoire constante quel que soit le nombre de factures
+    """
+
+    def __init__(self, max_jours: int = MAX_JOURS):
+        self.max_jours = max_jours
+        self.compte = 0
+        self.somme = 0.0
+        self.min = None
+        self.max = None
+        self.histogramme = np.zeros(max_jours + 1, dtype=np.int64)
+
+    @classmethod
+    def depuis(cls, valeurs, max_jours: int = MAX_JOURS) -> "LLTIStats":
+        stats = cls(max_jours)
+        stats.ajouter(valeurs)
+        return stats
+
+    def ajouter(self, valeurs):
+        """
+        Intègre un bloc de LLTI (jours) ; valeurs manquantes ou négatives ignorées
+        """
+        v = np.asarray(valeurs, dtype="float64")
+        v = v[~np.isnan(v) & (v >= 0)]
+        if len(v) == 0:
+            return self
+
+        jours = np.rint(v).astype(np.int64)
+
+        self.compte += len(jours)
+        self.somme += float(jours.sum())
+        self.min = int(jours.min()) if self.min is None else min(self.min, int(jours.min()))
+        self.max = int(jours.max()) if self.max is None else max(self.max, int(jours.max()))
+        self.histogramme += np.bincount(
+            np.minimum(jours, self.max_jours), minlength=self.max_jours + 1
+        )
+        return self
+
+    def fusionner(self, autre: "LLTIStats") -> "LLTIStats":
+        if autre.max_jours != self.max_jours:
+            raise ValueError("Histogrammes LLTI de bornes différentes")
+
+        out = LLTIStats(self.max_jours)
+        out.compte = self.compte + autre.compte
+        out.somme = self.somme + autre.somme
+        bornes_min = [m for m in (self.min, autre.min) if m is not None]
+        bornes_max = [m for m in (self.max, autre.max) if m is not None]
+        out.min = min(bornes_min) if bornes_min else None
+        out.max = max(bornes_max) if bornes_max else None
+        out.histogramme = self.histogramme + autre.histogramme
+        return out
+
+    __add__ = fusionner
+
+    def moyenne(self) -> float:
+        return self.somme / self.compte if self.compte else float("nan")
+
+    def _valeur_rang(self, rangs: np.ndarray) -> np.ndarray:
+        # k-ième plus petite valeur (k à partir de 0) via l'histogramme cumulé
+        cumul = np.cumsum(self.histogramme)
+        valeurs = np.searchsorted(cumul, rangs, side="right").astype("float64")
+        # Classe de débordement : bornée par le maximum observé
+        return np.where(valeurs >= self.max_jours, self.max, valeurs)
+
+    def quantiles(self, qs) -> np.ndarray:
+        """
+        Quantiles (interpolation linéaire, comme pandas / numpy)
+        """
+        qs = np.atleast_1d(np.asarray(qs, dtype="float64"))
+        if self.compte == 0:
+            return np.full(len(qs), np.nan)
+
+        position = qs * (self.compte - 1)
+        bas = np.floor(position)
+        v_bas = self._valeur_rang(bas)
+        v_haut = self._valeur_rang(np.ceil(position))
+        return v_bas + (v_haut - v_bas) * (position - bas)
+
+    def quantile(self, q: float) -> float:
+        return float(self.quantiles([q])[0])
+
+    def distribution(self, largeur: int = 1) -> pd.Series:
+        """
+        Nombre de factures par classe de `largeur` jours (classes non vides),
+        indexé par la borne basse de la classe
+        """
+        if self.compte == 0:
+            return pd.Series(dtype="int64", name="count")
+
+        n = self.max + 1 if self.max < self.max_jours else self.max_jours + 1
+        hist = self.histogramme[:n]
+        pad = (-len(hist)) % largeur
+        classes = np.pad(hist, (0, pad)).reshape(-1, largeur).sum(axis=1)
+
+        bornes = np.arange(len(classes)) * largeur
+        presentes = classes > 0
+        return pd.Series(
+            classes[presentes],
+            index=pd.Index(bornes[presentes], name="LLTI_jours"),
+            name="count"
+        )
@@ -0,0 +1,62 @@
+# preprocessing/memo.py
+
+from preprocessing.cache import LRUCache
+
+
+# ==================================================
+# MÉMOÏSATION DES ARTEFACTS DÉRIVÉS (par version de données + filtres)
+# ==================================================
+# Un cache LRU borné par artefact (grille d'exhaustivité, KPI, tableaux...) :
+# changer un filtre ne recalcule que les artefacts qui en dépendent, et une
+# nouvelle version de données ne touche pas aux entrées des autres versions
+MAX_ENTRIES = 32
+
+_artefacts: dict[str, LRUCache] = {}
+
+
+def _normaliser(valeur):
+    # Sélections multiples : l'ordre de saisie ne change pas le résultat
+    if isinstance(valeur, dict):
+        return tuple(sorted(
+            ((k, _normaliser(v)) for k, v in valeur.items()), key=repr
+        ))
+    if isinstance(valeur, (list, tuple, set, frozenset)):
+        return tuple(sorted((_normaliser(v) for v in valeur), key=repr))
+    if hasattr(valeur, "tolist"):
+        return _normaliser(valeur.tolist())
+    return valeur
+
+
+def filtres_cle(*filtres) -> tuple:
+    return tuple(_normaliser(f) for f in filtres)
+
+
+def memo(artefact: str, version, filtres: tuple, compute):
+    """
+    Résultat de `compute` mémoïsé par (version des données, filtres)
+    - version : hash des fichiers chargés (ou clé d'un jeu dérivé)
+    - filtres : valeurs des sélecteurs dont dépend l'artefact uniquement
+    """
+    cache = _artefacts.get(artefact)
+    if cache is None:
+        cache = _artefacts.setdefault(artefact, LRUCache(max_entries=MAX_ENTRIES))
+    return cache.get_or_compute((version, filtres_cle(*filtres)), compute)
+
+
+def invalider(version) -> int:
+    """
+    Supprime les artefacts d'une version de données (ex. entrepôt réécrit)
+    """
+    return sum(
+        cache.discard(lambda key: key[0] == version)
+        for cache in _artefacts.values()
+    )
+
+
+def memo_stats() -> dict:
+    return {nom: cache.stats() for nom, cache in sorted(_artefacts.items())}
+
+
+def clear_memo():
+    for cache in _artefacts.values():
+        cache.clear()
@@ -0,0 +1,163 @@
+# preprocessing/parallel_ingest.py
+
+import hashlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import pandas as pd
+
+from preprocessing.background_jobs import verifier_annulation
+from preprocessing.bo_stream import read_bo_filtered
+from preprocessing.ingestion import cached, read_bytes
+from preprocessing.pointage_warehouse import dater_extraction, garder_plus_recent
+from preprocessing.preprocess_productivite import preprocess_productivite
+from preprocessing.profiling import stage
+from preprocessing.schemas import SCHEMAS, SCHEMA_POINTAGE_JOUR, compacter
+from preprocessing.snapshot_store import load_or_ingest
+
+
+MAX_WORKERS = int(os.environ.get("COPILOT_INGEST_WORKERS", os.cpu_count() or 1))
+
+# Attente des workers par tranches : un job remplacé rend son thread sans
+# attendre la fin des fichiers en cours
+ATTENTE_S = 0.2
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _pool() -> ProcessPoolExecutor:
+    # Pool unique réutilisé entre les reruns ; "spawn" : pas de fork d'un
+    # serveur Streamlit multi-thread
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=MAX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+
+# ==================================================
+# TÂCHES (un fichier par tâche, exécutées dans les workers)
+# ==================================================
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+# Annulation vérifiée entre les étapes (effective quand la tâche s'exécute
+# dans le thread du job, cf. map_files) ; read_bo_filtered la vérifie par bloc
+def _tache_pointages(data: bytes) -> pd.DataFrame:
+    verifier_annulation()
+    df = load_or_ingest(data, _digest(data), "pointage")
+    verifier_annulation()
+    df = preprocess_productivite(df)
+    verifier_annulation()
+    return dater_extraction(df)
+
+
+def _tache_efficience(data: bytes) -> pd.DataFrame:
+    verifier_annulation()
+    return load_or_ingest(data, _digest(data), "efficience")
+
+
+def _tache_bo(data: bytes, debut) -> pd.DataFrame:
+    return read_bo_filtered(data, debut)
+
+
+def _sans_progression(fraction, message=None):
+    pass
+
+
+def map_files(tache, datas: list[bytes], *args,
+              progression=_sans_progression) -> list[pd.DataFrame]:
+    """
+    Applique `tache` à chaque fichier, en parallèle dès 2 fichiers
+    - progression(fraction, message) appelée après chaque fichier ; une
+      exception levée par progression annule les fichiers non démarrés
+    - Job remplacé : détecté pendant l'attente des workers, le thread du
+      job est rendu sans attendre les fichiers en cours
+    """
+    n = len(datas)
+
+    if n <= 1 or MAX_WORKERS <= 1:
+        resultats = []
+        for i, d in enumerate(datas, 1):
+            resultats.append(tache(d, *args))
+            progression(i / n, f"{i}/{n} fichier(s) traité(s)")
+        return resultats
+
+    futures = [_pool().submit(tache, d, *args) for d in datas]
+    try:
+        en_cours, faits = set(futures), 0
+        while en_cours:
+            _, en_cours = wait(
+                en_cours, timeout=ATTENTE_S, return_when=FIRST_COMPLETED
+            )
+            verifier_annulation()
+            if n - len(en_cours) > faits:
+                faits = n - len(en_cours)
+                progression(faits / n, f"{faits}/{n} fichier(s) traité(s)")
+    except BaseException:
+        for f in futures:
+            f.cancel()
+        raise
+    return [f.result() for f in futures]
+
+
+def _lot(sources, kind, tache, *args, schema, fusion=None,
+         progression=_sans_progression) -> pd.DataFrame:
+    datas = [read_bytes(s) for s in sources]
+    key = (tuple(_digest(d) for d in datas), kind, *args)
+
+    def compute():
+        with stage(f"ingest.lot.{kind}", rows_in=datas) as rec:
+            # Catégories propres à chaque fichier : recompactage après concat
+            df = pd.concat(
+                map_files(tache, datas, *args, progression=progression),
+                ignore_index=True
+            )
+            df = compacter(df, schema)
+            rec["rows_out"] = df = fusion(df) if fusion else df
+        return df
+
+    return cached(key, compute)
+
+
+# ==================================================
+# INGESTION MULTI-FICHIERS
+# ==================================================
+def ingest_pointages(sources, progression=_sans_progression) -> pd.DataFrame:
+    """
+    Pointages canoniques de plusieurs extractions (site / mois)
+    - Recouvrements (date, technicien) : l'extraction la plus récente l'emporte
+    """
+    return _lot(
+        sources,
+        "pointage_canonique",
+        _tache_pointages,
+        schema=SCHEMA_POINTAGE_JOUR,
+        fusion=lambda df: garder_plus_recent(df).reset_index(drop=True),
+        progression=progression
+    )
+
+
+def ingest_efficience(sources, progression=_sans_progression) -> pd.DataFrame:
+    return _lot(
+        sources, "efficience", _tache_efficience,
+        schema=SCHEMAS["efficience"], progression=progression
+    )
+
+
+def ingest_bo(sources, debut, progression=_sans_progression) -> pd.DataFrame:
+    """
+    BO filtré (sortie de filtrer_bo) de plusieurs exports ; la
+    déduplication facture par facture reste faite par finaliser_llti
+    """
+    return _lot(
+        sources, "bo_llti", _tache_bo, debut,
+        schema=SCHEMAS["bo"], progression=progression
+    )
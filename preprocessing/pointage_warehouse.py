@@ -0,0 +1,212 @@
+# preprocessing/pointage_warehouse.py
+
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+
+from preprocessing.cache import LRUCache
+from preprocessing.memo import invalider
+from preprocessing.productivite_cube import oublier_cube
+from preprocessing.schemas import SCHEMA_POINTAGE_JOUR, compacter
+from preprocessing.storage import DATA_DIR, atomic_write
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow optionnel
+    pq = None
+
+
+# ==================================================
+# ENTREPÔT LOCAL DES POINTAGES CANONIQUES
+# ==================================================
+# Une partition Parquet par mois : warehouse/pointages/Mois=AAAA-MM/part.parquet
+WAREHOUSE_DIR = DATA_DIR / "warehouse" / "pointages"
+
+# 1 ligne = 1 technicien / 1 jour
+CLE = ["Saisie heures - Date", "Salarié - Nom"]
+
+# Lecture-fusion-écriture des partitions sérialisée : deux jobs d'arrière-plan
+# fusionnant le même mois ne perdent pas les lignes l'un de l'autre
+_verrou = threading.Lock()
+
+# Fin de période couverte par l'extraction d'origine de chaque ligne : en cas
+# de doublon, la ligne de l'extraction la plus récente l'emporte, quel que
+# soit l'ordre de chargement des fichiers
+EXTRACTION = "Extraction"
+
+
+def warehouse_available() -> bool:
+    return pq is not None
+
+
+def _partition(mois: str):
+    return WAREHOUSE_DIR / f"Mois={mois}" / "part.parquet"
+
+
+def mois_disponibles() -> list[str]:
+    return sorted(
+        p.parent.name.split("=", 1)[1]
+        for p in WAREHOUSE_DIR.glob("Mois=*/part.parquet")
+    )
+
+
+def version_entrepot() -> tuple:
+    """
+    Version du contenu de l'entrepôt (chemins, dates de modification et
+    tailles des partitions) : change à chaque réécriture, y compris par un
+    autre processus
+    """
+    h = hashlib.sha1()
+    for p in sorted(WAREHOUSE_DIR.glob("Mois=*/part.parquet")):
+        st = p.stat()
+        h.update(f"{p.parent.name}:{st.st_mtime_ns}:{st.st_size};".encode())
+    return ("entrepot", h.hexdigest()[:16])
+
+
+def _invalider(version: tuple):
+    # Lectures, cube et artefacts mémoïsés de l'ancienne version
+    _lectures.discard(lambda key: key[0] == version)
+    oublier_cube(version)
+    invalider(version)
+
+
+def dater_extraction(df_day: pd.DataFrame) -> pd.DataFrame:
+    """
+    Date d'extraction d'un fichier canonique : dernier jour pointé
+    (une extraction "3 mois glissants" plus récente couvre des jours plus tardifs)
+    """
+    if EXTRACTION in df_day.columns:
+        return df_day
+    return df_day.assign(**{EXTRACTION: df_day["Saisie heures - Date"].max()})
+
+
+def garder_plus_recent(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Doublons (date, technicien) : ligne de l'extraction la plus récente
+    - Lignes historisées sans date d'extraction considérées comme les plus anciennes
+    - À date égale, la dernière chargée l'emporte (tri stable)
+    """
+    return (
+        df.sort_values(EXTRACTION, kind="stable", na_position="first")
+        .drop_duplicates(subset=CLE, keep="last")
+    )
+
+
+def _empreinte(df: pd.DataFrame) -> np.ndarray:
+    # Contenu d'une partition, indépendant de l'ordre des lignes et des
+    # catégories (les catégoriels sont hachés sur leurs valeurs)
+    return np.sort(
+        pd.util.hash_pandas_object(df[sorted(df.columns)], index=False).to_numpy()
+    )
+
+
+def _inchangee(existant: pd.DataFrame, fusion: pd.DataFrame) -> bool:
+    return (
+        len(existant) == len(fusion)
+        and set(existant.columns) == set(fusion.columns)
+        and np.array_equal(_empreinte(existant), _empreinte(fusion))
+    )
+
+
+def append_pointages(df_day: pd.DataFrame) -> dict:
+    """
+    Fusionne une extraction canonique (sortie de preprocess_productivite)
+    - Seules les partitions des mois présents sont réécrites, et seulement
+      si la fusion ajoute ou modifie des lignes (extraction déjà chargée :
+      entrepôt et caches intacts)
+    - Doublons (date, technicien) : l'extraction la plus récente l'emporte
+      (date d'extraction conservée dans la partition)
+    - Retourne le nombre de lignes nouvelles par mois
+    """
+    with _verrou:
+        return _fusionner_pointages(df_day)
+
+
+def _fusionner_pointages(df_day: pd.DataFrame) -> dict:
+    ajouts = {}
+    reecrites = 0
+    df_day = dater_extraction(df_day)
+    avant_ecriture = version_entrepot()
+
+    for mois, df_m in df_day.groupby("Mois", sort=True, observed=True):
+        path = _partition(mois)
+
+        if path.exists():
+            existant = compacter(
+                pq.read_table(path).to_pandas(), SCHEMA_POINTAGE_JOUR
+            )
+            avant = len(existant)
+            fusion = pd.concat([existant, df_m], ignore_index=True)
+        else:
+            avant = 0
+            fusion = df_m
+
+        fusion = (
+            garder_plus_recent(compacter(fusion, SCHEMA_POINTAGE_JOUR))
+            .sort_values(CLE)
+            .reset_index(drop=True)
+        )
+
+        ajouts[mois] = len(fusion) - avant
+        if avant and _inchangee(existant, fusion):
+            continue
+
+        atomic_write(
+            path,
+            lambda tmp: fusion.to_parquet(tmp, index=False)
+        )
+        reecrites += 1
+
+    if reecrites:
+        _invalider(avant_ecriture)
+    return ajouts
+
+
+# Lectures mises en cache par (version de l'entrepôt, bornes) : les reruns
+# ne relisent pas les partitions tant que l'entrepôt n'a pas changé
+_lectures = LRUCache(max_entries=4)
+
+
+def load_pointages(debut: str | None = None, fin: str | None = None) -> pd.DataFrame:
+    """
+    Pointages canoniques des mois [debut, fin] (bornes "AAAA-MM" incluses)
+    - Seules les partitions concernées sont lues
+    - Résultat partagé (cache) : à ne pas modifier en place
+    """
+    return _lectures.get_or_compute(
+        (version_entrepot(), debut, fin),
+        lambda: _lire_partitions(debut, fin)
+    )
+
+
+def _lire_partitions(debut: str | None, fin: str | None) -> pd.DataFrame:
+    mois = [
+        m for m in mois_disponibles()
+        if (debut is None or m >= debut) and (fin is None or m <= fin)
+    ]
+    if not mois:
+        return pd.DataFrame()
+
+    # Catégories propres à chaque partition : concat en object, puis recompactage
+    return compacter(
+        pd.concat(
+            [pq.read_table(_partition(m), memory_map=True).to_pandas() for m in mois],
+            ignore_index=True
+        ),
+        SCHEMA_POINTAGE_JOUR
+    )
+
+
+def productivite_ytd(annee: int | None = None) -> float | None:
+    """
+    Productivité cumulée de l'année (Facturable / Hr_Totale) sur l'entrepôt
+    """
+    annee = annee or pd.Timestamp.today().year
+    df = load_pointages(f"{annee}-01", f"{annee}-12")
+    if df.empty:
+        return None
+
+    total_trav = df["Hr_Totale"].sum()
+    return df["Facturable"].sum() / total_trav if total_trav > 0 else 0
@@ -1,7 +1,30 @@
 # preprocessing/productivite_preprocessing.py
 
+import numpy as np
 import pandas as pd
 
+from preprocessing.profiling import profiled
+from preprocessing.schemas import SCHEMA_POINTAGE_JOUR, compacter
+
+
+# ==================================================
+# COLONNES MINIMALES REQUISES
+# ==================================================
+REQUIRED_COLS = [
+    "Saisie heures - Date",
+    "Salarié - Nom",
+    "Equipe3",
+    "Facturable",
+    "Hr_travaillée",
+    "Hr_Totale",
+    "Hr_Théorique",
+    "Jour_semaine"
+]
+
+HEURES_COLS = ["Facturable", "Hr_travaillée", "Hr_Totale", "Hr_Théorique"]
+
+
+@profiled("preprocess.productivite")
 def preprocess_productivite(df_raw: pd.DataFrame) -> pd.DataFrame:
     """
     Préprocessing Productivité
@@ -10,47 +33,36 @@ def preprocess_productivite(df_raw: pd.DataFrame) -> pd.DataFrame:
     - Produit un DF canonique (1 ligne = 1 tech / 1 jour)
     """
 
-    df = df_raw.copy()
-    st.write("Colonnes détectées :")
-    for c in df.columns:
-        st.write(f"'{c}'")
-
-
-    # ==================================================
-    # COLONNES MINIMALES REQUISES
-    # ==================================================
-    required_cols = [
-        "Saisie heures - Date",
-        "Salarié - Nom",
-        "Equipe3",
-        "Facturable",
-        "Hr_travaillée",
-        "Hr_Totale",
-        "Hr_Théorique",
-        "Jour_semaine"
-    ]
-
-    missing = [c for c in required_cols if c not in df.columns]
+    missing = [c for c in REQUIRED_COLS if c not in df_raw.columns]
     if missing:
         raise ValueError(f"Colonnes manquantes : {missing}")
 
     # ==================================================
-    # TYPAGE
+    # TYPAGE (colonnes requises uniquement)
     # ==================================================
-    df["Saisie heures - Date"] = pd.to_datetime(
-        df["Saisie heures - Date"], errors="coerce"
-    )
-
-    for col in ["Facturable", "Hr_travaillée", "Hr_Totale", "Hr_Théorique"]:
-        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
+    df = pd.DataFrame({
+        "Saisie heures - Date": pd.to_datetime(
+            df_raw["Saisie heures - Date"], errors="coerce"
+        ),
+        "Salarié - Nom": df_raw["Salarié - Nom"],
+        "Equipe3": df_raw["Equipe3"],
+        "Jour_semaine": df_raw["Jour_semaine"],
+        **{
+            col: pd.to_numeric(df_raw[col], errors="coerce").fillna(0)
+            for col in HEURES_COLS
+        },
+    })
 
-    df = df[df["Saisie heures - Date"].notna()]
-    df = df[df["Salarié - Nom"].notna()]
+    df = df[
+        df["Saisie heures - Date"].notna()
+        & df["Salarié - Nom"].notna()
+    ]
 
     # ==================================================
     # AGRÉGATION MÉTIER (LE POINT CLÉ)
     # ==================================================
     # 👉 plusieurs lignes possibles par jour / technicien
+    # (Hr_Théorique et Hr_Totale sont des valeurs journalières répétées)
     df_day = (
         df
         .groupby(
@@ -59,14 +71,15 @@ def preprocess_productivite(df_raw: pd.DataFrame) -> pd.DataFrame:
                 "Salarié - Nom",
                 "Equipe3",
                 "Jour_semaine",
-                "Hr_Théorique"
+                "Hr_Théorique",
                 "Hr_Totale"
             ],
-            as_index=False
+            as_index=False,
+            observed=True
         )
         .agg(
             {
-                "Hr_Travaillée": "sum",
+                "Hr_travaillée": "sum",
                 "Facturable": "sum"
             }
         )
@@ -75,16 +88,31 @@ def preprocess_productivite(df_raw: pd.DataFrame) -> pd.DataFrame:
     # ==================================================
     # FEATURES TEMPORELLES
     # ==================================================
-    df_day["Jour"] = df_day["Saisie heures - Date"].dt.day
-    df_day["Mois"] = df_day["Saisie heures - Date"].dt.to_period("M").astype(str)
+    dates = df_day["Saisie heures - Date"]
+    df_day["Jour"] = dates.dt.day
+
+    # Libellé "AAAA-MM" calculé sur les mois distincts seulement (catégorie)
+    mois_codes, mois_uniques = pd.factorize(
+        dates.to_numpy().astype("datetime64[M]"), sort=True
+    )
+    df_day["Mois"] = pd.Categorical.from_codes(
+        mois_codes, mois_uniques.astype(str)
+    )
 
     # ==================================================
-    # PRODUCTIVITÉ JOUR
+    # PRODUCTIVITÉ JOUR (division sûre)
     # ==================================================
-    df_day["Productivite_jour"] = df_day.apply(
-        lambda r: r["Facturable"] / r["Hr_travaillée"]
-        if r["Hr_Totale"] > 0 else 0,
-        axis=1
+    facturable = df_day["Facturable"].to_numpy(dtype="float64")
+    travaillee = df_day["Hr_travaillée"].to_numpy(dtype="float64")
+
+    df_day["Productivite_jour"] = np.divide(
+        facturable,
+        travaillee,
+        out=np.zeros(len(df_day)),
+        where=(df_day["Hr_Totale"].to_numpy() > 0) & (travaillee != 0)
     )
 
-    return df_day.reset_index(drop=True)
+    # ==================================================
+    # TYPES COMPACTS (catégories, float32, int8)
+    # ==================================================
+    return compacter(df_day, SCHEMA_POINTAGE_JOUR)
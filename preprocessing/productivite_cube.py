@@ -0,0 +1,132 @@
+# preprocessing/productivite_cube.py
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from preprocessing.cache import LRUCache
+from preprocessing.profiling import profiled
+
+
+# Dimensions du cube, dans l'ordre de tri des cellules
+DIMENSIONS = ["Mois", "Equipe3", "Salarié - Nom", "Saisie heures - Date"]
+
+ROLLUPS = {
+    "mois": "Mois",
+    "tech": "Salarié - Nom",
+    "date": "Saisie heures - Date",
+    "equipe": "Equipe3",
+}
+
+
+@dataclass(frozen=True)
+class ProductiviteCube:
+    """
+    Cube pré-agrégé Facturable / Hr_Totale
+    - 1 cellule = (Mois, Equipe, Salarié, Date), triées par (Mois, Equipe)
+    - bornes[m, e] = tranche [début, fin) des cellules du couple (mois, équipe)
+    """
+
+    labels: dict
+    codes: dict
+    facturable: np.ndarray
+    heures: np.ndarray
+    bornes: np.ndarray
+
+    def selection(self, mois, equipes) -> np.ndarray:
+        """
+        Index des cellules des couples (mois, équipe) sélectionnés
+        """
+        m = np.flatnonzero(np.isin(self.labels["Mois"], np.atleast_1d(mois)))
+        e = np.flatnonzero(np.isin(self.labels["Equipe3"], list(equipes)))
+
+        tranches = self.bornes[np.ix_(m, e)].reshape(-1, 2)
+        tranches = tranches[tranches[:, 1] > tranches[:, 0]]
+        if len(tranches) == 0:
+            return np.empty(0, dtype=np.intp)
+
+        return np.concatenate([np.arange(a, b) for a, b in tranches])
+
+    def totaux(self, mois, equipes) -> tuple[float, float]:
+        idx = self.selection(mois, equipes)
+        return float(self.facturable[idx].sum()), float(self.heures[idx].sum())
+
+    def rollup(self, mois, equipes, by: str) -> pd.DataFrame:
+        """
+        Agrégation des cellules sélectionnées par mois, technicien, date ou équipe
+        """
+        col = ROLLUPS[by]
+        idx = self.selection(mois, equipes)
+        labels = self.labels[col]
+        codes = self.codes[col][idx]
+
+        n = len(labels)
+        presents = np.bincount(codes, minlength=n) > 0
+        heures = np.bincount(codes, weights=self.heures[idx], minlength=n)
+        facturable = np.bincount(codes, weights=self.facturable[idx], minlength=n)
+
+        out = pd.DataFrame({
+            col: labels[presents],
+            "Heures": heures[presents],
+            "Facturable": facturable[presents],
+        })
+        out["Productivité"] = np.divide(
+            out["Facturable"].to_numpy(),
+            out["Heures"].to_numpy(),
+            out=np.full(len(out), np.nan),
+            where=out["Heures"].to_numpy() > 0
+        )
+        return out
+
+
+@profiled("aggregate.cube")
+def build_cube(df: pd.DataFrame) -> ProductiviteCube:
+    """
+    Construit le cube depuis le DF canonique (1 ligne = 1 tech / 1 jour)
+    """
+    cells = (
+        df.groupby(DIMENSIONS, sort=True, observed=True)
+        .agg(Facturable=("Facturable", "sum"), Hr_Totale=("Hr_Totale", "sum"))
+        .reset_index()
+    )
+
+    codes, labels = {}, {}
+    for col in DIMENSIONS:
+        codes[col], uniques = pd.factorize(cells[col], sort=True)
+        labels[col] = np.asarray(uniques)
+
+    m = codes["Mois"]
+    e = codes["Equipe3"]
+    n_mois, n_equipes = len(labels["Mois"]), len(labels["Equipe3"])
+
+    # Tranches contiguës par (mois, équipe) grâce au tri des cellules
+    groupe = m * n_equipes + e
+    debuts = np.searchsorted(groupe, np.arange(n_mois * n_equipes), side="left")
+    fins = np.searchsorted(groupe, np.arange(n_mois * n_equipes), side="right")
+    bornes = np.stack([debuts, fins], axis=1).reshape(n_mois, n_equipes, 2)
+
+    return ProductiviteCube(
+        labels=labels,
+        codes=codes,
+        facturable=cells["Facturable"].to_numpy(dtype="float64"),
+        heures=cells["Hr_Totale"].to_numpy(dtype="float64"),
+        bornes=bornes,
+    )
+
+
+_cubes = LRUCache(max_entries=4)
+
+
+def cube_for(key, df: pd.DataFrame) -> ProductiviteCube:
+    """
+    Cube construit une seule fois par jeu de données (clé = version ingérée)
+    """
+    return _cubes.get_or_compute(key, lambda: build_cube(df))
+
+
+def oublier_cube(key) -> int:
+    """
+    Supprime le cube d'une version devenue obsolète (ex. entrepôt réécrit)
+    """
+    return _cubes.discard(lambda k: k == key)
@@ -0,0 +1,196 @@
+# preprocessing/profiling.py
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+
+# ==================================================
+# INSTRUMENTATION DES ÉTAPES (ingest / preprocess / aggregate / render)
+# ==================================================
+# Désactivée par défaut : coût nul hors mode debug. Activation :
+# - COPILOT_PROFILING=1 : tout le processus (batch, scripts), profil commun
+# - set_enabled : contexte courant seulement (une session Streamlit et les
+#   jobs qu'elle lance), avec son propre profil ; les autres sessions ne
+#   sont ni mesurées ni mélangées à ce profil
+_env = os.environ.get("COPILOT_PROFILING") == "1"
+
+TAILLE_PROFIL = 500
+
+_records = deque(maxlen=TAILLE_PROFIL)
+_profil = contextvars.ContextVar("copilot_profil", default=None)
+_lock = threading.Lock()
+_local = threading.local()
+
+# tracemalloc est global au processus : démarrage / arrêt comptés par étape
+# active, sous verrou. Une étape chevauchée par une étape d'un autre thread
+# (jobs d'arrière-plan) est marquée "concurrent" et son pic n'est pas
+# attribuable : il n'est pas enregistré, et reset_peak n'est appelé que
+# lorsqu'un seul thread mesure
+_tm_lock = threading.Lock()
+_tm_cadres = {}
+_tm_proprio = False
+
+
+def nouveau_profil() -> deque:
+    return deque(maxlen=TAILLE_PROFIL)
+
+
+def set_enabled(actif: bool, profil: deque | None = None):
+    """
+    Active / désactive le profilage pour le contexte courant
+    - profil : étapes de la session (sinon profil commun du processus)
+    - Sans effet sur COPILOT_PROFILING=1 (toujours actif)
+    """
+    _profil.set((_records if profil is None else profil) if actif else None)
+
+
+def _profil_courant() -> deque | None:
+    profil = _profil.get()
+    if profil is None and _env:
+        return _records
+    return profil
+
+
+def is_enabled() -> bool:
+    return _profil_courant() is not None
+
+
+def _rows(obj):
+    if obj is None or isinstance(obj, int):
+        return obj
+    if hasattr(obj, "shape"):
+        return int(obj.shape[0])
+    if isinstance(obj, (list, tuple)):
+        return len(obj)
+    return None
+
+
+@contextmanager
+def stage(nom: str, rows_in=None):
+    """
+    Mesure une étape : temps mur, lignes entrée/sortie, pic mémoire (tracemalloc)
+    - Renseigner rec["rows_out"] dans le bloc pour les lignes en sortie
+    - Pic non renseigné si un autre thread mesurait en même temps
+    """
+    rec = {"stage": nom, "rows_in": _rows(rows_in), "rows_out": None}
+    profil = _profil_courant()
+    if profil is None:
+        yield rec
+        return
+
+    pile = getattr(_local, "pile", None)
+    if pile is None:
+        pile = _local.pile = []
+
+    global _tm_proprio
+    cadre = {"thread": threading.get_ident(), "concurrent": False}
+    with _tm_lock:
+        if not _tm_cadres and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tm_proprio = True
+
+        _tm_cadres[id(cadre)] = cadre
+        if any(c["thread"] != cadre["thread"] for c in _tm_cadres.values()):
+            for c in _tm_cadres.values():
+                c["concurrent"] = True
+
+        courant, pic = tracemalloc.get_traced_memory()
+        if pile:
+            pile[-1]["pic"] = max(pile[-1]["pic"], pic)
+        if not cadre["concurrent"]:
+            tracemalloc.reset_peak()
+        cadre.update(base=courant, pic=courant)
+
+    pile.append(cadre)
+    t0 = time.perf_counter()
+
+    try:
+        yield rec
+    finally:
+        wall = time.perf_counter() - t0
+        pile.pop()
+
+        with _tm_lock:
+            pic = max(cadre["pic"], tracemalloc.get_traced_memory()[1])
+
+            # Le pic de l'étape compte aussi pour l'étape englobante
+            if pile:
+                pile[-1]["pic"] = max(pile[-1]["pic"], pic)
+
+            del _tm_cadres[id(cadre)]
+            if not _tm_cadres and _tm_proprio:
+                tracemalloc.stop()
+                _tm_proprio = False
+            elif all(c["thread"] == cadre["thread"] for c in _tm_cadres.values()):
+                tracemalloc.reset_peak()
+
+        rec.update({
+            "rows_out": _rows(rec["rows_out"]),
+            "wall_ms": round(wall * 1000, 2),
+            "peak_mb": (
+                None if cadre["concurrent"]
+                else round((pic - cadre["base"]) / 1024 / 1024, 2)
+            ),
+            "concurrent": cadre["concurrent"],
+            "depth": len(pile),
+            "at": datetime.now().isoformat(timespec="seconds"),
+        })
+        with _lock:
+            profil.append(rec)
+
+
+def profiled(nom: str):
+    """
+    Décorateur : le premier argument compte comme entrée, le résultat comme sortie
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not is_enabled():
+                return func(*args, **kwargs)
+            with stage(nom, rows_in=args[0] if args else None) as rec:
+                result = func(*args, **kwargs)
+                rec["rows_out"] = result
+            return result
+        return wrapper
+    return decorator
+
+
+def records() -> list[dict]:
+    """
+    Étapes du profil courant (session en mode debug, ou profil commun)
+    """
+    profil = _profil_courant()
+    if profil is None:
+        return []
+    with _lock:
+        return list(profil)
+
+
+def clear():
+    profil = _profil_courant()
+    if profil is not None:
+        with _lock:
+            profil.clear()
+
+
+def export_json() -> str:
+    """
+    Profil exportable (à joindre aux tickets performance)
+    """
+    return json.dumps(
+        {
+            "exported_at": datetime.now().isoformat(timespec="seconds"),
+            "stages": records(),
+        },
+        indent=2,
+        ensure_ascii=False
+    )
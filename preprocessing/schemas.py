@@ -0,0 +1,132 @@
+# preprocessing/schemas.py
+
+import pandas as pd
+
+
+# ==================================================
+# SCHÉMAS DES EXTRACTIONS
+# ==================================================
+# Types :
+#   "date" : datetime64
+#   "num"  : float32 (heures, temps, ratios)
+#   "int8" : petits entiers sans valeur manquante (jour du mois, de la semaine)
+#   "cat"  : category (libellés répétés : techniciens, équipes, clients...)
+#   "str"  : string (identifiants quasi uniques : OR, facture)
+
+SCHEMA_POINTAGE = {
+    "Saisie heures - Date": "date",
+    "Salarié - Nom": "cat",
+    "Equipe3": "cat",
+    "Facturable": "num",
+    "Hr_travaillée": "num",
+    "Hr_Totale": "num",
+    "Hr_Théorique": "num",
+    "Jour_semaine": "num",
+}
+
+# DF canonique Productivité (1 ligne = 1 tech / 1 jour)
+SCHEMA_POINTAGE_JOUR = {
+    "Saisie heures - Date": "date",
+    "Salarié - Nom": "cat",
+    "Equipe3": "cat",
+    "Jour_semaine": "int8",
+    "Hr_Théorique": "num",
+    "Hr_Totale": "num",
+    "Hr_travaillée": "num",
+    "Facturable": "num",
+    "Jour": "int8",
+    "Mois": "cat",
+    "Productivite_jour": "num",
+    "Extraction": "date",
+}
+
+SCHEMA_BO = {
+    "N° OR (Segment)": "str",
+    "N° Facture (Lignes)": "str",
+    "Date Facture (Lignes)": "date",
+    "Pointage dernière date (Segment)": "date",
+    "Nom Client OR (or)": "cat",
+    "Numéro série Equipement (Segment)": "cat",
+    "Constructeur de l'équipement": "cat",
+}
+
+SCHEMA_EFFICIENCE = {
+    "OR": "str",
+    "Nom Client OR (or)": "cat",
+    "Equipe": "cat",
+    "Technicien": "cat",
+    "Position": "cat",
+    "Type OR": "cat",
+    "Temps_reference": "num",
+    "Temps_consomé_BO": "num",
+    "Efficience_OR": "num",
+    "Planifié ?": "cat",
+}
+
+SCHEMAS = {
+    "pointage": SCHEMA_POINTAGE,
+    "bo": SCHEMA_BO,
+    "efficience": SCHEMA_EFFICIENCE,
+}
+
+
+def _as_str(s: pd.Series) -> pd.Series:
+    # Numéros (OR, facture, série) lus en float par Excel : 12345.0 -> "12345"
+    if pd.api.types.is_float_dtype(s):
+        entiers = s.dropna()
+        if (entiers == entiers.round()).all():
+            s = s.astype("Int64")
+    return s.astype("string")
+
+
+def _typer(s: pd.Series, kind: str) -> pd.Series:
+    # Sans conversion si la colonne a déjà le type cible
+    if kind == "date":
+        if pd.api.types.is_datetime64_any_dtype(s):
+            return s
+        return pd.to_datetime(s, errors="coerce")
+    if kind == "num":
+        return pd.to_numeric(s, errors="coerce").astype("float32")
+    if kind == "int8":
+        return pd.to_numeric(s).astype("int8")
+    if kind == "cat":
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            return s
+        return s.astype("category")
+    return _as_str(s)
+
+
+def apply_schema(df: pd.DataFrame, schema: dict) -> pd.DataFrame:
+    """
+    Typage d'une extraction brute selon son schéma
+    - Projection sur les colonnes du schéma présentes
+    - Colonnes absentes laissées absentes (contrôlées par le preprocessing)
+    """
+    cols = [c for c in schema if c in df.columns]
+    out = {col: _typer(df[col], schema[col]) for col in cols}
+
+    return pd.DataFrame(out, index=df.index).reset_index(drop=True)
+
+
+def compacter(df: pd.DataFrame, schema: dict) -> pd.DataFrame:
+    """
+    Types compacts d'un DF déjà typé, sans projection ni copie des colonnes
+    déjà conformes (ex. après concat de fichiers aux catégories différentes)
+    """
+    a_typer = {}
+    for col, kind in schema.items():
+        if col in df.columns:
+            s = _typer(df[col], kind)
+            if s.dtype != df[col].dtype:
+                a_typer[col] = s
+
+    return df.assign(**a_typer) if a_typer else df
+
+
+def octets_par_ligne(df: pd.DataFrame) -> float:
+    """
+    Empreinte mémoire réelle (chaînes comprises) rapportée au nombre de lignes
+    """
+    if len(df) == 0:
+        return 0.0
+    return df.memory_usage(deep=True, index=False).sum() / len(df)
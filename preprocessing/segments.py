@@ -0,0 +1,44 @@
+# preprocessing/segments.py
+
+import numpy as np
+import pandas as pd
+
+
+# ==================================================
+# RÉDUCTIONS PAR SEGMENT (agrégations groupées vectorisées)
+# ==================================================
+# Données triées par (groupe, valeur) : chaque groupe est un segment contigu,
+# réduit sans boucle Python (np.add.reduceat, lecture directe des quantiles)
+
+
+def codes_groupes(s: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Codes entiers (-1 : manquant) et libellés d'une colonne de regroupement
+    """
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return s.cat.codes.to_numpy(), np.asarray(s.cat.categories)
+    codes, labels = pd.factorize(s)
+    return codes, np.asarray(labels)
+
+
+def segments(codes_tries: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Début et longueur de chaque segment de codes identiques consécutifs
+    """
+    debuts = np.flatnonzero(np.r_[True, codes_tries[1:] != codes_tries[:-1]])
+    comptes = np.diff(np.r_[debuts, len(codes_tries)])
+    return debuts, comptes
+
+
+def quantile_segments(valeurs_triees: np.ndarray, debuts: np.ndarray,
+                      comptes: np.ndarray, q: float) -> np.ndarray:
+    """
+    Quantile q de chaque segment trié (interpolation linéaire, comme pandas)
+    """
+    position = debuts + q * (comptes - 1)
+    bas = np.floor(position).astype(np.intp)
+    haut = np.ceil(position).astype(np.intp)
+    return (
+        valeurs_triees[bas]
+        + (valeurs_triees[haut] - valeurs_triees[bas]) * (position - bas)
+    )
@@ -0,0 +1,148 @@
+# preprocessing/snapshot_store.py
+
+import io
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from preprocessing.schemas import SCHEMAS, apply_schema
+from preprocessing.storage import DATA_DIR, atomic_write, data_path
+from preprocessing.profiling import profiled
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow optionnel
+    pa = None
+    pq = None
+
+
+# Incrémenter à chaque changement de schéma : invalide les snapshots existants
+SCHEMA_VERSION = 2
+
+META_KEY = b"copilot.snapshot"
+
+
+def snapshots_available() -> bool:
+    return pq is not None
+
+
+def snapshot_path(kind: str, digest: str):
+    return data_path("snapshots", kind, f"{digest}.parquet")
+
+
+def read_snapshot_meta(path) -> dict | None:
+    """
+    Métadonnées d'un snapshot (hash source, lignes, date d'ingestion)
+    """
+    try:
+        schema = pq.read_schema(path)
+        meta = json.loads(schema.metadata[META_KEY])
+        meta["parquet_rows"] = pq.read_metadata(path).num_rows
+        return meta
+    except (OSError, KeyError, TypeError, ValueError, pa.ArrowException):
+        return None
+
+
+def is_stale(meta: dict | None, kind: str, digest: str) -> bool:
+    """
+    Un snapshot est périmé s'il est illisible, issu d'un autre fichier,
+    d'une autre version de schéma, ou tronqué
+    """
+    return (
+        meta is None
+        or meta.get("kind") != kind
+        or meta.get("source_hash") != digest
+        or meta.get("schema_version") != SCHEMA_VERSION
+        or meta.get("rows") != meta.get("parquet_rows")
+    )
+
+
+def write_snapshot(df: pd.DataFrame, kind: str, digest: str):
+    meta = {
+        "kind": kind,
+        "source_hash": digest,
+        "rows": len(df),
+        "schema_version": SCHEMA_VERSION,
+        "ingested_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), META_KEY: json.dumps(meta)}
+    )
+
+    atomic_write(
+        snapshot_path(kind, digest),
+        lambda tmp: pq.write_table(table, tmp)
+    )
+    return meta
+
+
+def read_snapshot(kind: str, digest: str) -> pd.DataFrame | None:
+    """
+    Lecture memory-mappée d'un snapshot valide, None sinon
+    """
+    path = snapshot_path(kind, digest)
+    if not path.exists() or is_stale(read_snapshot_meta(path), kind, digest):
+        return None
+    return pq.read_table(path, memory_map=True).to_pandas()
+
+
+@profiled("ingest.extraction")
+def load_or_ingest(data: bytes, digest: str, kind: str) -> pd.DataFrame:
+    """
+    Extraction typée : snapshot Parquet si disponible, sinon parsing Excel
+    (une seule fois) puis écriture du snapshot
+    """
+    schema = SCHEMAS[kind]
+
+    if snapshots_available():
+        df = read_snapshot(kind, digest)
+        if df is not None:
+            return df
+
+    df = apply_schema(pd.read_excel(io.BytesIO(data)), schema)
+
+    if snapshots_available():
+        write_snapshot(df, kind, digest)
+
+    return df
+
+
+def list_snapshots() -> pd.DataFrame:
+    """
+    Inventaire des snapshots locaux avec détection des fichiers périmés
+    """
+    rows = []
+    paths = (DATA_DIR / "snapshots").glob("*/*.parquet")
+    for path in sorted(paths) if snapshots_available() else []:
+        kind, digest = path.parent.name, path.stem
+        meta = read_snapshot_meta(path) or {}
+        rows.append({
+            "kind": kind,
+            "source_hash": digest,
+            "rows": meta.get("rows"),
+            "ingested_at": meta.get("ingested_at"),
+            "stale": is_stale(meta or None, kind, digest),
+            "path": str(path),
+        })
+    return pd.DataFrame(
+        rows,
+        columns=["kind", "source_hash", "rows", "ingested_at", "stale", "path"]
+    )
+
+
+def purge_stale_snapshots() -> int:
+    """
+    Supprime les snapshots périmés, retourne le nombre de fichiers supprimés
+    """
+    if not snapshots_available():
+        return 0
+    inventaire = list_snapshots()
+    stale = inventaire[inventaire["stale"]]
+    for path in stale["path"]:
+        Path(path).unlink(missing_ok=True)
+    return len(stale)
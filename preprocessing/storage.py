@@ -0,0 +1,42 @@
+# preprocessing/storage.py
+
+import os
+import uuid
+from pathlib import Path
+
+
+# ==================================================
+# RÉPERTOIRE DE DONNÉES LOCAL
+# ==================================================
+DATA_DIR = Path(
+    os.environ.get(
+        "COPILOT_DATA_DIR",
+        Path(__file__).resolve().parent.parent / "data"
+    )
+)
+
+
+def data_path(*parts: str) -> Path:
+    """
+    Chemin sous le répertoire de données (dossiers parents créés)
+    """
+    path = DATA_DIR.joinpath(*parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def atomic_write(path: Path, write):
+    """
+    Écriture atomique : `write(tmp_path)` puis renommage
+    (un lecteur concurrent ne voit jamais un fichier partiel)
+    - Fichier temporaire propre à chaque appel (threads d'un même processus)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()